@@ -2,81 +2,227 @@
 Contact form API endpoint.
 """
 
+import asyncio
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+from pydantic import ValidationError
 
 from app.config import get_settings
-from app.models import ContactFormRequest, ContactMessage, ContactResponse
+from app.models import (
+    ContactBatchItemResult,
+    ContactBatchRequest,
+    ContactBatchResponse,
+    ContactFormRequest,
+    ContactMessage,
+    ContactResponse,
+)
+from app.services.admission import AdaptiveConcurrencyLimiter
+from app.services.client_ip import rate_limit_bucket, resolve_client_ip
+from app.services.deadline import Deadline, DeadlineBudget, DeadlineExceededError
+from app.services.idempotency import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IdempotencyConflictError,
+    idempotency_store,
+    request_fingerprint,
+)
 from app.services.kafka_producer import kafka_producer
+from app.services.outbox import outbox
 from app.services.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Shared by the dependency calls of one POST /contact
+contact_deadline = DeadlineBudget("submit_contact", get_settings().contact_deadline_seconds)
 
-def get_client_ip(request: Request) -> str:
-    """Extract client IP from request, considering proxies."""
-    # Check X-Forwarded-For header (set by Traefik/nginx)
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        # Take the first IP (original client)
-        return forwarded.split(",")[0].strip()
+# Sheds POST /contact load when downstream calls slow down
+contact_admission = AdaptiveConcurrencyLimiter(
+    "submit_contact",
+    initial_limit=get_settings().contact_concurrency_initial,
+    min_limit=get_settings().contact_concurrency_min,
+    max_limit=get_settings().contact_concurrency_max,
+    target_latency=get_settings().contact_target_latency_ms / 1000,
+)
 
-    # Check X-Real-IP header
-    real_ip = request.headers.get("x-real-ip")
-    if real_ip:
-        return real_ip
+# Deadline stages that reflect dependency latency (idempotency includes waiting)
+DOWNSTREAM_STAGES = ("rate_limit", "kafka", "outbox")
 
-    # Fallback to direct client
-    if request.client:
-        return request.client.host
 
-    return "unknown"
+def get_client_ip(request: Request) -> str:
+    """Extract client IP from request, trusting forwarding headers only from known proxies."""
+    return resolve_client_ip(
+        peer=request.client.host if request.client else None,
+        # Set by Traefik/nginx
+        forwarded_for=request.headers.get("x-forwarded-for"),
+        real_ip=request.headers.get("x-real-ip"),
+    )
+
+
+def missing_channel_contact(form: ContactFormRequest) -> str | None:
+    """Return the first selected channel without contact information, if any."""
+    for channel in form.channels:
+        if not getattr(form.contacts, channel.value, None):
+            return channel.value
+    return None
 
 
 @router.post("/contact", response_model=ContactResponse)
 async def submit_contact(
     request: Request,
+    response: Response,
     form: ContactFormRequest,
     api_key: Annotated[str, Header(alias="api-key")],
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
 ):
     """
     Submit a contact form request.
 
     This endpoint accepts contact form submissions and queues them
-    for processing via Kafka.
+    for processing via Kafka. Retries that repeat the Idempotency-Key
+    header get the original response instead of a second submission.
     """
     settings = get_settings()
 
-    # Validate API key
+    # Validate API key (before an Idempotency-Key can replay a stored response)
     if api_key != settings.public_api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
         )
 
+    # Reject excess load before it reaches Redis or Kafka
+    admitted = settings.contact_admission_enabled
+    if admitted and not contact_admission.try_acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again later.",
+            headers={"Retry-After": str(settings.contact_shed_retry_after_seconds)},
+        )
+
+    deadline = contact_deadline.start()
+    overloaded = False
+
+    try:
+        if not idempotency_key:
+            return await _submit_contact(request, response, form, deadline)
+        return await _submit_idempotent(request, response, form, deadline, idempotency_key)
+    except DeadlineExceededError as e:
+        overloaded = True
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Request timed out waiting for {e.stage}. Please try again later.",
+        ) from None
+    except HTTPException as e:
+        overloaded = e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        raise
+    finally:
+        if admitted:
+            latencies = {
+                stage: seconds
+                for stage, seconds in deadline.timings.items()
+                if stage in DOWNSTREAM_STAGES
+            }
+            contact_admission.release(latencies, overloaded)
+
+
+async def _submit_idempotent(
+    request: Request,
+    response: Response,
+    form: ContactFormRequest,
+    deadline: Deadline,
+    idempotency_key: str,
+) -> ContactResponse:
+    """Run _submit_contact once per Idempotency-Key and replay its response."""
+    if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key longer than {IDEMPOTENCY_KEY_MAX_LENGTH} characters",
+        )
+
+    fingerprint = request_fingerprint(form.model_dump_json())
+    # Answer 409 while there is still time to, instead of waiting into a 504
+    max_wait = min(get_settings().idempotency_wait_seconds, deadline.remaining() / 2)
+    try:
+        stored = await deadline.run(
+            "idempotency", idempotency_store.begin(idempotency_key, fingerprint, max_wait)
+        )
+    except IdempotencyConflictError as e:
+        if e.reason == "mismatch":
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            ) from None
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+        ) from None
+
+    if stored is not None:
+        response.status_code = stored.status_code
+        response.headers["Idempotent-Replayed"] = "true"
+        return ContactResponse.model_validate(stored.body)
+
+    try:
+        result = await _submit_contact(request, response, form, deadline)
+    except DeadlineExceededError as e:
+        # Once the message was handed to Kafka or the outbox it may still be delivered:
+        # keep the claim until it expires so an immediate retry cannot publish it twice
+        if e.stage not in ("kafka", "outbox"):
+            await idempotency_store.release(idempotency_key)
+        raise
+    except Exception:
+        # Failed requests are not recorded so the client can retry
+        await idempotency_store.release(idempotency_key)
+        raise
+
+    await idempotency_store.complete(
+        idempotency_key,
+        fingerprint,
+        response.status_code or status.HTTP_200_OK,
+        result.model_dump(mode="json"),
+    )
+    return result
+
+
+async def _submit_contact(
+    request: Request,
+    response: Response,
+    form: ContactFormRequest,
+    deadline: Deadline,
+) -> ContactResponse:
+    """Handle POST /contact; every dependency call runs within `deadline`."""
+    settings = get_settings()
+
     # Get client IP for rate limiting
     client_ip = get_client_ip(request)
 
-    # Check rate limit
-    if not await rate_limiter.is_allowed(client_ip):
-        remaining = await rate_limiter.get_remaining(client_ip)
+    # Check rate limit (the verdict carries everything needed for headers)
+    try:
+        verdict = await deadline.run(
+            "rate_limit",
+            rate_limiter.is_allowed(rate_limit_bucket(client_ip)),
+            timeout=settings.contact_rate_limit_timeout_seconds,
+        )
+    except DeadlineExceededError:
+        # Cancelled before Redis timed out itself: let the breaker see the hang
+        verdict = rate_limiter.fail_open_after_timeout()
+    if not verdict.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Try again later. Remaining: {remaining}",
-            headers={"Retry-After": str(settings.rate_limit_window_seconds)},
+            detail=f"Rate limit exceeded. Try again in {verdict.retry_after} seconds.",
+            headers=verdict.headers(),
         )
+    response.headers.update(verdict.headers())
 
     # Validate that at least one contact method is provided for selected channels
-    for channel in form.channels:
-        contact_value = getattr(form.contacts, channel.value, None)
-        if not contact_value:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Contact information required for channel: {channel.value}",
-            )
+    missing = missing_channel_contact(form)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Contact information required for channel: {missing}",
+        )
 
     # Create message for Kafka
     message = ContactMessage(
@@ -88,8 +234,25 @@ async def submit_contact(
         user_agent=request.headers.get("user-agent"),
     )
 
-    # Send to Kafka
-    success = await kafka_producer.send_contact_message(message)
+    # Send to Kafka (async-ack mode only waits for the producer buffer), leaving
+    # time for the outbox write if Kafka is too slow
+    if settings.kafka_async_ack:
+        send = kafka_producer.enqueue_contact_message(message)
+        response.status_code = status.HTTP_202_ACCEPTED
+    else:
+        send = kafka_producer.send_contact_message(message)
+    reserve = settings.contact_outbox_reserve_seconds if outbox.enabled else 0.0
+    try:
+        success = await deadline.run("kafka", send, reserve=reserve)
+    except DeadlineExceededError:
+        if not outbox.enabled:
+            raise
+        success = False
+
+    # Keep the message on local disk until Kafka is back
+    if not success and outbox.enabled:
+        logger.warning(f"Kafka unavailable, writing {message.id} to outbox")
+        success = await deadline.run("outbox", outbox.append(message))
 
     if not success:
         logger.error(f"Failed to queue contact message: {message.id}")
@@ -105,3 +268,93 @@ async def submit_contact(
         message="Your message has been received. We will contact you soon!",
         id=message.id,
     )
+
+
+@router.post("/contact/batch", response_model=ContactBatchResponse)
+async def submit_contact_batch(
+    request: Request,
+    batch: ContactBatchRequest,
+    api_key: Annotated[str, Header(alias="api-key")],
+):
+    """
+    Submit many contact form requests at once.
+
+    Intended for lead migrations and partner forwarding. Items are validated
+    individually and the valid ones are published as one producer batch;
+    the response reports an id or an error per item, in request order.
+    """
+    settings = get_settings()
+
+    # Validate API key (bulk ingestion has its own key and no per-IP limit)
+    if not settings.batch_api_key or api_key != settings.batch_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key",
+        )
+
+    if len(batch.items) > settings.contact_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch too large: at most {settings.contact_batch_max_items} items",
+        )
+
+    client_ip = get_client_ip(request)
+    user_agent = request.headers.get("user-agent")
+
+    results: list[ContactBatchItemResult] = []
+    messages: list[ContactMessage] = []
+    for index, item in enumerate(batch.items):
+        try:
+            form = ContactFormRequest.model_validate(item)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )
+            results.append(ContactBatchItemResult(index=index, status="rejected", error=errors))
+            continue
+
+        missing = missing_channel_contact(form)
+        if missing:
+            results.append(
+                ContactBatchItemResult(
+                    index=index,
+                    status="rejected",
+                    error=f"Contact information required for channel: {missing}",
+                )
+            )
+            continue
+
+        message = ContactMessage(
+            name=form.name,
+            message=form.message,
+            channels=form.channels,
+            contacts=form.contacts,
+            ip_address=client_ip,
+            user_agent=user_agent,
+        )
+        messages.append(message)
+        results.append(ContactBatchItemResult(index=index, status="queued", id=message.id))
+
+    delivered = await kafka_producer.send_contact_messages(messages) if messages else []
+
+    # Keep undelivered messages on local disk until Kafka is back
+    undelivered = [m for m, ok in zip(messages, delivered, strict=True) if not ok]
+    if undelivered and outbox.enabled:
+        stored = await asyncio.gather(*(outbox.append(m) for m in undelivered))
+        undelivered = [m for m, ok in zip(undelivered, stored, strict=True) if not ok]
+
+    by_id = {result.id: result for result in results if result.id is not None}
+    for message in undelivered:
+        by_id[message.id].status = "failed"
+        by_id[message.id].error = "Service temporarily unavailable"
+
+    counts = {
+        name: sum(result.status == name for result in results)
+        for name in ("queued", "rejected", "failed")
+    }
+    logger.info(
+        f"Contact batch from {client_ip}: {counts['queued']} queued, "
+        f"{counts['rejected']} rejected, {counts['failed']} failed"
+    )
+
+    return ContactBatchResponse(**counts, results=results)
@@ -13,8 +13,12 @@ from typing import Any
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
 
+from app.api.contact import contact_admission, contact_deadline
 from app.config import get_settings
+from app.services.circuit_breaker import CircuitState
+from app.services.idempotency import idempotency_store
 from app.services.kafka_producer import kafka_producer
+from app.services.outbox import outbox
 from app.services.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -50,7 +54,7 @@ async def readiness_check() -> JSONResponse:
 
     Checks if all critical dependencies are available:
     - Redis Sentinel connection
-    - Kafka connection
+    - Kafka connection with topic metadata warmed up
 
     Returns:
         200 if ready, 503 if not ready
@@ -64,7 +68,11 @@ async def readiness_check() -> JSONResponse:
 
     # Check Redis Sentinel
     try:
-        if rate_limiter._redis is not None:
+        if rate_limiter.breaker.state == CircuitState.OPEN:
+            # Don't stall the probe on a socket timeout we already know about
+            checks["redis"]["status"] = "unhealthy"
+            checks["redis"]["details"] = "circuit breaker open"
+        elif rate_limiter._redis is not None:
             # Ping Redis
             await rate_limiter._redis.ping()
 
@@ -92,11 +100,12 @@ async def readiness_check() -> JSONResponse:
     # Check Kafka
     try:
         if kafka_producer._producer is not None:
-            # Kafka producer is connected
-            checks["kafka"]["status"] = "healthy"
+            # Connected; ready once topic metadata is loaded and validated
+            checks["kafka"]["status"] = "healthy" if kafka_producer.ready else "warming_up"
             checks["kafka"]["details"] = {
                 "bootstrap_servers": settings.kafka_bootstrap_servers,
                 "topic": settings.kafka_topic,
+                "warmup": kafka_producer.warmup_status(),
             }
         else:
             checks["kafka"]["status"] = "not_connected"
@@ -116,6 +125,12 @@ async def readiness_check() -> JSONResponse:
         content={
             "status": "ready" if all_healthy else "not_ready",
             "checks": checks,
+            "rate_limiter": rate_limiter.stats(),
+            "kafka_producer": kafka_producer.stats(),
+            "outbox": await outbox.stats(),
+            "deadlines": {contact_deadline.name: contact_deadline.stats()},
+            "admission": {contact_admission.name: contact_admission.stats()},
+            "idempotency": idempotency_store.stats(),
             "environment": settings.environment,
         },
     )
@@ -37,3 +37,19 @@ class ContactRecord(Base):
 
     def __repr__(self) -> str:
         return f"<ContactRecord {self.id} from {self.name}>"
+
+
+class NotificationRecord(Base):
+    """Telegram notification already sent for a contact (keyed by contact id)."""
+
+    __tablename__ = "contact_notifications"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    notified_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotificationRecord {self.id} at {self.notified_at}>"
@@ -3,13 +3,16 @@ Database service for contact storage.
 """
 
 import logging
+from datetime import datetime
+from uuid import UUID
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
 from app.models import ContactMessage
 
-from .models import Base, ContactRecord
+from .models import Base, ContactRecord, NotificationRecord
 
 logger = logging.getLogger(__name__)
 
@@ -56,19 +59,80 @@ class DatabaseService:
         if self._session_factory is None:
             raise RuntimeError("Database not connected")
 
-        record = ContactRecord(
-            id=message.id,
-            name=message.name,
-            message=message.message,
-            channels=[c.value for c in message.channels],
-            contacts=message.contacts.model_dump(),
-            ip_address=message.ip_address,
-            user_agent=message.user_agent,
-            created_at=message.created_at,
-        )
+        record = ContactRecord(**contact_row(message))
 
         async with self._session_factory() as session:
             session.add(record)
             await session.commit()
             logger.info(f"Contact saved to database: {record.id}")
             return record
+
+    async def save_contacts(self, messages: list[ContactMessage]) -> set[UUID]:
+        """
+        Save contact messages in one transaction.
+
+        Uses a multi-row INSERT ... ON CONFLICT (id) DO NOTHING, so messages
+        already stored (redelivered by Kafka or the outbox) are skipped.
+        Returns the ids that were actually inserted.
+        """
+        if self._session_factory is None:
+            raise RuntimeError("Database not connected")
+        if not messages:
+            return set()
+
+        processed_at = datetime.utcnow()
+        rows = [{**contact_row(message), "processed_at": processed_at} for message in messages]
+
+        async with self._session_factory() as session:
+            # executemany with RETURNING is sent as batched multi-row VALUES
+            result = await session.execute(insert_contacts_statement(), rows)
+            inserted = set(result.scalars().all())
+            await session.commit()
+
+        logger.info(f"Saved {len(inserted)} of {len(messages)} contacts to database")
+        return inserted
+
+    async def is_notified(self, contact_id: UUID) -> bool:
+        """Whether the notification for a contact has already been sent."""
+        if self._session_factory is None:
+            raise RuntimeError("Database not connected")
+
+        async with self._session_factory() as session:
+            return await session.get(NotificationRecord, contact_id) is not None
+
+    async def mark_notified(self, contact_id: UUID) -> None:
+        """Record that the notification for a contact was sent; repeats are ignored."""
+        if self._session_factory is None:
+            raise RuntimeError("Database not connected")
+
+        statement = (
+            insert(NotificationRecord)
+            .values(id=contact_id, notified_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[NotificationRecord.id])
+        )
+        async with self._session_factory() as session:
+            await session.execute(statement)
+            await session.commit()
+
+
+def contact_row(message: ContactMessage) -> dict:
+    """Column values of a ContactRecord for a contact message."""
+    return {
+        "id": message.id,
+        "name": message.name,
+        "message": message.message,
+        "channels": [c.value for c in message.channels],
+        "contacts": message.contacts.model_dump(),
+        "ip_address": message.ip_address,
+        "user_agent": message.user_agent,
+        "created_at": message.created_at,
+    }
+
+
+def insert_contacts_statement():
+    """INSERT into contacts that skips existing ids and returns the inserted ones."""
+    return (
+        insert(ContactRecord)
+        .on_conflict_do_nothing(index_elements=[ContactRecord.id])
+        .returning(ContactRecord.id)
+    )
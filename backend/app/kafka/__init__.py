@@ -3,5 +3,6 @@ Kafka module for message processing.
 """
 
 from .consumer import KafkaConsumerService
+from .notifier import NotificationConsumerService
 
-__all__ = ["KafkaConsumerService"]
+__all__ = ["KafkaConsumerService", "NotificationConsumerService"]
@@ -0,0 +1,155 @@
+"""
+Wire codec for contact messages on Kafka.
+
+Converts ContactMessage to and from bytes in a single pass. Two formats are
+supported and announced in the `content-format` record header:
+
+- `json`: the original JSON document (also assumed when the header is
+  missing, so records written before the header existed still decode).
+- `contact-msgpack/<version>`: MessagePack array with fields in the order
+  given by the schema version, without field names, with a 16-byte UUID
+  and an integer timestamp.
+
+Consumers decode both, so rolling over is: deploy consumers, then switch
+producers with KAFKA_WIRE_FORMAT.
+"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import msgpack
+import pydantic_core
+
+from app.models import ContactChannel, ContactInfo, ContactMessage
+
+FORMAT_HEADER = "content-format"
+JSON_FORMAT = "json"
+MSGPACK_FORMAT = "msgpack"
+
+# Positional schemas for the binary format, by version. Append new versions,
+# never change an existing one: records on the topic outlive deployments.
+CONTACT_SCHEMAS: dict[int, dict[str, tuple[str, ...]]] = {
+    1: {
+        "fields": (
+            "id",
+            "name",
+            "message",
+            "channels",
+            "contacts",
+            "ip_address",
+            "user_agent",
+            "created_at",
+        ),
+        "contacts": ("email", "telegram", "vk", "phone", "website", "max", "whatsapp"),
+    },
+}
+CURRENT_SCHEMA_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+Headers = list[tuple[str, bytes]]
+
+
+def _format_name(wire_format: str) -> bytes:
+    if wire_format == JSON_FORMAT:
+        return JSON_FORMAT.encode()
+    if wire_format == MSGPACK_FORMAT:
+        return f"contact-msgpack/{CURRENT_SCHEMA_VERSION}".encode()
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+
+def wire_headers(wire_format: str = JSON_FORMAT) -> Headers:
+    """Kafka headers announcing how the record value is encoded."""
+    return [(FORMAT_HEADER, _format_name(wire_format))]
+
+
+def _pack_v1(message: ContactMessage) -> bytes:
+    schema = CONTACT_SCHEMAS[1]
+    created_at = message.created_at
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+
+    contacts = message.contacts
+    packed: bytes = msgpack.packb(
+        [
+            message.id.bytes,
+            message.name,
+            message.message,
+            [channel.value for channel in message.channels],
+            [getattr(contacts, field) for field in schema["contacts"]],
+            message.ip_address,
+            message.user_agent,
+            (created_at - _EPOCH) // _MICROSECOND,
+        ]
+    )
+    return packed
+
+
+def _unpack_fields(data: bytes, version: int) -> dict:
+    """Map a binary record back to ContactMessage field names and types."""
+    schema = CONTACT_SCHEMAS.get(version)
+    if schema is None:
+        raise ValueError(f"Unsupported contact schema version: {version}")
+
+    values = dict(zip(schema["fields"], msgpack.unpackb(data), strict=True))
+    values["id"] = UUID(bytes=values["id"])
+    values["channels"] = [ContactChannel(channel) for channel in values["channels"]]
+    values["contacts"] = dict(zip(schema["contacts"], values["contacts"], strict=True))
+    values["created_at"] = _EPOCH + values["created_at"] * _MICROSECOND
+    return values
+
+
+def _schema_version(headers: Headers | None) -> int | None:
+    """Binary schema version announced in the headers, None for JSON."""
+    for key, value in headers or ():
+        if key != FORMAT_HEADER:
+            continue
+        name = value.decode()
+        if name == JSON_FORMAT:
+            return None
+        prefix, _, version = name.partition("/")
+        if prefix != "contact-msgpack" or not version.isdigit():
+            raise ValueError(f"Unknown wire format: {name}")
+        return int(version)
+    return None
+
+
+def encode_contact(message: ContactMessage, wire_format: str = JSON_FORMAT) -> bytes:
+    """Serialize a contact message in the given wire format."""
+    if wire_format == MSGPACK_FORMAT:
+        return _pack_v1(message)
+    if wire_format == JSON_FORMAT:
+        return pydantic_core.to_json(message)
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+
+def decode_contact(data: bytes, headers: Headers | None = None) -> ContactMessage:
+    """Parse and validate a contact message, using the format announced in `headers`."""
+    version = _schema_version(headers)
+    if version is None:
+        return ContactMessage.model_validate_json(data)
+
+    # Binary records are only written by encode_contact from validated models,
+    # so field validators (email checks, stripping) are not re-run here
+    values = _unpack_fields(data, version)
+    values["contacts"] = ContactInfo.model_construct(**values["contacts"])
+    return ContactMessage.model_construct(**values)
+
+
+def encode_dead_letter(data: bytes, error: str, headers: Headers | None = None) -> bytes:
+    """
+    Wrap a failed record for the DLQ as {"original_message": ..., "error": ...}.
+
+    The DLQ is always JSON: binary records are converted, and records that
+    cannot be decoded are embedded as a string.
+    """
+    try:
+        version = _schema_version(headers)
+        if version is None:
+            original = pydantic_core.from_json(data)
+        else:
+            original = _unpack_fields(data, version)
+    except (ValueError, TypeError):
+        original = data.decode("utf-8", errors="replace")
+    return pydantic_core.to_json({"original_message": original, "error": error})
@@ -3,48 +3,103 @@ Kafka consumer for processing contact messages.
 """
 
 import asyncio
-import json
 import logging
+import time
+from collections import deque
+from uuid import UUID
 
-from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, ConsumerRebalanceListener, TopicPartition
+from sqlalchemy.exc import IntegrityError
 
 from app.config import get_settings
 from app.database.service import DatabaseService
+from app.kafka.codec import Headers, decode_contact, encode_dead_letter
 from app.models import ContactMessage
-from app.telegram.bot import send_notification
 
 logger = logging.getLogger(__name__)
 
 
+class _CommitOnRevoke(ConsumerRebalanceListener):
+    """Commit processed offsets before partitions move to another worker."""
+
+    def __init__(self, service: "KafkaConsumerService"):
+        self._service = service
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        # Let in-flight records of the revoked partitions finish so their offsets count
+        await self._service._drain(set(revoked))
+        await self._service._commit_pending(force=True)
+        self._service._forget_partitions(set(revoked))
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        pass
+
+
+class _PartitionOffsets:
+    """
+    In-flight offsets of one partition.
+
+    Records may complete out of order; only the contiguous completed prefix
+    is committable, so a restart never skips an unfinished record.
+    """
+
+    def __init__(self):
+        self._in_flight: deque[int] = deque()
+        self._completed: set[int] = set()
+
+    def start(self, offset: int) -> None:
+        self._in_flight.append(offset)
+
+    def complete(self, offset: int) -> int | None:
+        """Mark `offset` done; returns the new offset to commit, if it advanced."""
+        self._completed.add(offset)
+        committable = None
+        while self._in_flight and self._in_flight[0] in self._completed:
+            first = self._in_flight.popleft()
+            self._completed.discard(first)
+            committable = first + 1
+        return committable
+
+
 class KafkaConsumerService:
     """Async Kafka consumer for processing contact requests."""
 
     def __init__(self):
         self._consumer: AIOKafkaConsumer | None = None
-        self._dlq_producer: AIOKafkaProducer | None = None
+        self._producer: AIOKafkaProducer | None = None
         self._settings = get_settings()
         self._running = False
         self._db = DatabaseService()
 
+        # Next offset to commit per partition, flushed in one commit call
+        self._pending_offsets: dict[TopicPartition, int] = {}
+        self._last_commit = time.monotonic()
+
+        # Concurrent processing: one lane per (partition, key), bounded globally
+        self._slots = asyncio.Semaphore(self._settings.kafka_consumer_max_concurrency)
+        self._offsets: dict[TopicPartition, _PartitionOffsets] = {}
+        self._lanes: dict[tuple[TopicPartition, bytes | None], asyncio.Task] = {}
+        self._tasks: dict[asyncio.Task, TopicPartition] = {}
+
     async def start(self) -> None:
         """Start the Kafka consumer."""
         self._consumer = AIOKafkaConsumer(
-            self._settings.kafka_topic,
             bootstrap_servers=self._settings.kafka_bootstrap_servers,
             group_id=self._settings.kafka_consumer_group,
             auto_offset_reset="earliest",
             enable_auto_commit=False,  # Manual commit for reliability
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
+            fetch_max_wait_ms=self._settings.kafka_consumer_fetch_max_wait_ms,
+            max_partition_fetch_bytes=self._settings.kafka_consumer_max_partition_fetch_bytes,
         )
+        self._consumer.subscribe([self._settings.kafka_topic], listener=_CommitOnRevoke(self))
 
-        # DLQ producer for failed messages
-        self._dlq_producer = AIOKafkaProducer(
+        # Producer for notify events and failed messages (DLQ)
+        self._producer = AIOKafkaProducer(
             bootstrap_servers=self._settings.kafka_bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
         )
 
         await self._consumer.start()
-        await self._dlq_producer.start()
+        await self._producer.start()
         await self._db.connect()
 
         logger.info("Kafka consumer started")
@@ -54,12 +109,14 @@ class KafkaConsumerService:
         self._running = False
 
         if self._consumer:
+            await self._drain()
+            await self._commit_pending(force=True)
             await self._consumer.stop()
             self._consumer = None
 
-        if self._dlq_producer:
-            await self._dlq_producer.stop()
-            self._dlq_producer = None
+        if self._producer:
+            await self._producer.stop()
+            self._producer = None
 
         await self._db.disconnect()
 
@@ -78,15 +135,14 @@ class KafkaConsumerService:
                 # Fetch messages with timeout
                 messages = await self._consumer.getmany(
                     timeout_ms=1000,
-                    max_records=10,
+                    max_records=self._settings.kafka_consumer_max_records,
                 )
 
-                for tp, records in messages.items():
-                    for record in records:
-                        await self._process_message(record.value)
+                if messages:
+                    await self._process_batch(messages)
 
-                        # Commit offset after successful processing
-                        await self._consumer.commit()
+                # One commit for all partitions (or per interval) of what has completed
+                await self._commit_pending()
 
             except asyncio.CancelledError:
                 logger.info("Consumer loop cancelled")
@@ -95,64 +151,196 @@ class KafkaConsumerService:
                 logger.exception(f"Error in consumer loop: {e}")
                 await asyncio.sleep(5)  # Back off on error
 
-    async def _process_message(self, data: dict) -> None:
-        """Process a single contact message."""
-        try:
-            message = ContactMessage(**data)
-            logger.info(f"Processing contact message: {message.id}")
+        await self._drain()
+        await self._commit_pending()
+
+    async def _process_batch(self, messages: dict[TopicPartition, list]) -> None:
+        """
+        Bulk-save a fetched batch in one transaction, then dispatch the records.
+
+        If the bulk write fails, every record falls back to its own insert so
+        one bad row does not fail the whole batch.
+        """
+        batch = []
+        for tp, records in messages.items():
+            for record in records:
+                try:
+                    message = decode_contact(record.value, record.headers)
+                except Exception:
+                    message = None  # Decoded again and dead-lettered by _process_message
+                batch.append((tp, record, message))
+
+        contacts = [message for _, _, message in batch if message is not None]
+        saved: set[UUID] | None = set()
+        if contacts:
+            try:
+                saved = await self._db.save_contacts(contacts)
+            except Exception as e:
+                logger.warning(f"Bulk save of {len(contacts)} contacts failed: {e}")
+                saved = None
 
-            # 1. Save to database
-            await self._db.save_contact(message)
-            logger.info(f"Saved contact to database: {message.id}")
+        for tp, record, message in batch:
+            await self._dispatch(tp, record, message, saved)
 
-            # 2. Send Telegram notification with retry
-            success = await self._send_with_retry(message)
+    async def _dispatch(
+        self,
+        tp: TopicPartition,
+        record,
+        message: ContactMessage | None = None,
+        saved: set[UUID] | None = None,
+    ) -> None:
+        """
+        Schedule a record on its lane once a concurrency slot is free.
+
+        Records with the same key (or without a key) in a partition run in
+        offset order; different keys and partitions run concurrently.
+        """
+        await self._slots.acquire()
+        self._offsets.setdefault(tp, _PartitionOffsets()).start(record.offset)
+
+        lane = (tp, record.key)
+        previous = self._lanes.get(lane)
+        task = asyncio.create_task(self._process_in_lane(tp, record, message, saved, previous))
+        self._lanes[lane] = task
+        self._tasks[task] = tp
+
+        def done(task: asyncio.Task) -> None:
+            self._tasks.pop(task, None)
+            if self._lanes.get(lane) is task:
+                del self._lanes[lane]
+
+        task.add_done_callback(done)
+
+    async def _process_in_lane(
+        self,
+        tp: TopicPartition,
+        record,
+        message: ContactMessage | None,
+        saved: set[UUID] | None,
+        previous: asyncio.Task | None,
+    ) -> None:
+        processed = False
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            await self._process_message(record.value, record.headers, message, saved)
+            processed = True  # Failures go to the DLQ, so they count as processed
+        finally:
+            self._slots.release()
+            offsets = self._offsets.get(tp)
+            if processed and offsets is not None:
+                committable = offsets.complete(record.offset)
+                if committable is not None:
+                    self._pending_offsets[tp] = committable
+
+    async def _drain(self, partitions: set[TopicPartition] | None = None) -> None:
+        """Wait for in-flight records (of `partitions`, or all) to finish."""
+        tasks = [task for task, tp in self._tasks.items() if partitions is None or tp in partitions]
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _forget_partitions(self, partitions: set[TopicPartition]) -> None:
+        """Drop offset tracking for partitions this worker no longer owns."""
+        for tp in partitions:
+            self._offsets.pop(tp, None)
+            self._pending_offsets.pop(tp, None)
+
+    async def _commit_pending(self, force: bool = False) -> None:
+        """
+        Commit processed offsets explicitly, in one request for all partitions.
+
+        Without `force`, commits at most every kafka_consumer_commit_interval_ms.
+        """
+        if not self._pending_offsets or self._consumer is None:
+            return
 
-            if not success:
-                logger.error(f"Failed to send notification for {message.id}")
-                await self._send_to_dlq(data, "telegram_notification_failed")
+        interval = self._settings.kafka_consumer_commit_interval_ms / 1000
+        if not force and time.monotonic() - self._last_commit < interval:
+            return
 
-            logger.info(f"Successfully processed message: {message.id}")
+        # Partitions lost in a rebalance can no longer be committed by this worker
+        assigned = self._consumer.assignment()
+        offsets = {tp: offset for tp, offset in self._pending_offsets.items() if tp in assigned}
+        self._pending_offsets.clear()
+        if not offsets:
+            return
 
+        try:
+            await self._consumer.commit(offsets)
+            self._last_commit = time.monotonic()
         except Exception as e:
-            logger.exception(f"Failed to process message: {e}")
-            await self._send_to_dlq(data, str(e))
+            # Keep them for the next attempt; worst case is redelivery
+            for tp, offset in offsets.items():
+                self._pending_offsets.setdefault(tp, offset)
+            logger.error(f"Failed to commit offsets {offsets}: {e}")
 
-    async def _send_with_retry(
+    async def _process_message(
         self,
-        message: ContactMessage,
-        max_retries: int = 3,
-    ) -> bool:
-        """Send Telegram notification with exponential backoff retry."""
-        for attempt in range(max_retries):
-            try:
-                success = await send_notification(message)
-                if success:
-                    return True
-            except Exception as e:
-                logger.warning(f"Notification attempt {attempt + 1} failed: {e}")
+        data: bytes,
+        headers: Headers | None = None,
+        message: ContactMessage | None = None,
+        saved: set[UUID] | None = None,
+    ) -> None:
+        """
+        Process a single contact message.
+
+        `saved` holds the ids inserted by the batch's bulk write; without it
+        the message is saved on its own.
+        """
+        try:
+            if message is None:
+                message = decode_contact(data, headers)
+            logger.info(f"Processing contact message: {message.id}")
 
-            if attempt < max_retries - 1:
-                delay = 2**attempt  # Exponential backoff: 1, 2, 4 seconds
-                await asyncio.sleep(delay)
+            # 1. Save to database (outbox relays and redeliveries may repeat a message id)
+            if saved is None:
+                try:
+                    await self._db.save_contact(message)
+                    stored = True
+                except IntegrityError:
+                    stored = False
+            else:
+                stored = message.id in saved
+            if stored:
+                logger.info(f"Saved contact to database: {message.id}")
+            else:
+                logger.info(f"Contact message already stored: {message.id}")
+
+            # 2. Hand the notification to the notifier stage (see app.kafka.notifier).
+            # Also for stored ids: the earlier attempt may have failed before publishing,
+            # and the notifier skips ids it has already notified
+            await self._publish_notification(message, data, headers)
 
-        return False
+            logger.info(f"Successfully processed message: {message.id}")
 
-    async def _send_to_dlq(self, data: dict, error: str) -> None:
+        except Exception as e:
+            logger.exception(f"Failed to process message: {e}")
+            await self._send_to_dlq(data, str(e), headers)
+
+    async def _publish_notification(
+        self, message: ContactMessage, data: bytes, headers: Headers | None = None
+    ) -> None:
+        """Publish the saved message to the notify topic."""
+        if self._producer is None:
+            raise RuntimeError("Producer not available for notifications")
+
+        await self._producer.send_and_wait(
+            topic=self._settings.kafka_notify_topic,
+            value=data,
+            key=str(message.id).encode("utf-8"),
+            headers=list(headers or []),
+        )
+
+    async def _send_to_dlq(self, data: bytes, error: str, headers: Headers | None = None) -> None:
         """Send failed message to Dead Letter Queue."""
-        if self._dlq_producer is None:
-            logger.error("DLQ producer not available")
+        if self._producer is None:
+            logger.error("Producer not available for DLQ")
             return
 
         try:
-            dlq_message = {
-                "original_message": data,
-                "error": error,
-            }
-
-            await self._dlq_producer.send_and_wait(
+            await self._producer.send_and_wait(
                 topic=self._settings.kafka_dlq_topic,
-                value=dlq_message,
+                value=encode_dead_letter(data, error, headers),
             )
             logger.info(f"Message sent to DLQ: {error}")
         except Exception as e:
@@ -0,0 +1,280 @@
+"""
+Telegram notification stage.
+
+The contact processor saves a message, commits it and publishes it to the
+notify topic; NotificationConsumerService delivers it. A failed delivery is
+not retried in place: the record is republished to the next retry topic
+(10 s, 1 min, 10 min by default) stamped with the time it becomes due, and
+after the last tier it goes to the DLQ. A retry partition whose next record
+is not due yet is paused until it is, so a backoff never blocks the notify
+topic or any other partition.
+
+The notify topic is at-least-once (redeliveries, outbox relays and async-ack
+replays republish the same message id), so sent notifications are recorded
+in the database and a repeated id is skipped.
+"""
+
+import asyncio
+import logging
+import time
+
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, ConsumerRebalanceListener, TopicPartition
+
+from app.config import get_settings
+from app.database.service import DatabaseService
+from app.kafka.codec import Headers, decode_contact, encode_dead_letter
+from app.telegram.bot import send_notification
+
+logger = logging.getLogger(__name__)
+
+ATTEMPT_HEADER = "notify-attempt"  # Retries already made
+NOT_BEFORE_HEADER = "notify-not-before"  # Epoch milliseconds
+
+
+def retry_topic(notify_topic: str, delay: int) -> str:
+    """Name of the retry topic tier with `delay` seconds of backoff."""
+    return f"{notify_topic}-retry-{delay}s"
+
+
+def _header(headers: Headers | None, name: str) -> bytes | None:
+    for key, value in headers or ():
+        if key == name:
+            return value
+    return None
+
+
+def retry_headers(headers: Headers | None, attempt: int, not_before_ms: int) -> Headers:
+    """Original headers with the retry attempt and due time replaced."""
+    kept = [(k, v) for k, v in headers or () if k not in (ATTEMPT_HEADER, NOT_BEFORE_HEADER)]
+    return kept + [
+        (ATTEMPT_HEADER, str(attempt).encode()),
+        (NOT_BEFORE_HEADER, str(not_before_ms).encode()),
+    ]
+
+
+class _ForgetOnRevoke(ConsumerRebalanceListener):
+    """Drop pause timers of partitions that move to another worker."""
+
+    def __init__(self, service: "NotificationConsumerService"):
+        self._service = service
+
+    async def on_partitions_revoked(self, revoked) -> None:
+        for tp in revoked:
+            self._service._resume_at.pop(tp, None)
+
+    async def on_partitions_assigned(self, assigned) -> None:
+        pass
+
+
+class NotificationConsumerService:
+    """Consumes notify events and delivers them to Telegram with delayed retries."""
+
+    def __init__(self):
+        self._consumer: AIOKafkaConsumer | None = None
+        self._producer: AIOKafkaProducer | None = None
+        self._db = DatabaseService()
+        self._settings = get_settings()
+        self._running = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        self._delays = self._settings.kafka_notify_retry_delays_list
+        self._retry_topics = [
+            retry_topic(self._settings.kafka_notify_topic, delay) for delay in self._delays
+        ]
+        # Paused retry partitions and when their next record becomes due (monotonic)
+        self._resume_at: dict[TopicPartition, float] = {}
+
+    async def start(self) -> None:
+        """Start the notifier consumer and its retry/DLQ producer."""
+        self._consumer = AIOKafkaConsumer(
+            bootstrap_servers=self._settings.kafka_bootstrap_servers,
+            group_id=self._settings.kafka_notifier_group,
+            auto_offset_reset="earliest",
+            enable_auto_commit=False,
+        )
+        self._consumer.subscribe(
+            [self._settings.kafka_notify_topic, *self._retry_topics],
+            listener=_ForgetOnRevoke(self),
+        )
+        self._producer = AIOKafkaProducer(
+            bootstrap_servers=self._settings.kafka_bootstrap_servers,
+        )
+
+        await self._db.connect()
+        await self._consumer.start()
+        await self._producer.start()
+
+        logger.info(f"Notifier started, retry topics: {', '.join(self._retry_topics)}")
+
+    async def stop(self) -> None:
+        """Stop after the batch in progress has been committed."""
+        self._running = False
+        await self._idle.wait()
+
+        if self._consumer:
+            await self._consumer.stop()
+            self._consumer = None
+
+        if self._producer:
+            await self._producer.stop()
+            self._producer = None
+
+        await self._db.disconnect()
+        logger.info("Notifier stopped")
+
+    async def run(self) -> None:
+        """Run the notifier loop."""
+        if self._consumer is None:
+            raise RuntimeError("Notifier not started")
+
+        self._running = True
+        logger.info("Starting notifier loop...")
+
+        while self._running:
+            try:
+                self._resume_due()
+                messages = await self._consumer.getmany(
+                    timeout_ms=1000,
+                    max_records=self._settings.kafka_consumer_max_records,
+                )
+                if not messages:
+                    continue
+
+                # Partitions are independent: one waiting or slow never holds up another
+                self._idle.clear()
+                try:
+                    tps = list(messages)
+                    processed = await asyncio.gather(
+                        *(self._handle_partition(tp, messages[tp]) for tp in tps)
+                    )
+                    await self._commit(
+                        {tp: offset for tp, offset in zip(tps, processed) if offset is not None}
+                    )
+                finally:
+                    self._idle.set()
+
+            except asyncio.CancelledError:
+                logger.info("Notifier loop cancelled")
+                break
+            except Exception as e:
+                logger.exception(f"Error in notifier loop: {e}")
+                await asyncio.sleep(5)  # Back off on error
+
+    def _resume_due(self) -> None:
+        """Resume paused retry partitions whose next record is due."""
+        if self._consumer is None:
+            return
+
+        now = time.monotonic()
+        for tp, resume_at in list(self._resume_at.items()):
+            if resume_at <= now:
+                del self._resume_at[tp]
+                if tp in self._consumer.assignment():
+                    self._consumer.resume(tp)
+
+    async def _handle_partition(self, tp: TopicPartition, records: list) -> int | None:
+        """
+        Deliver records in order until one is not due yet.
+
+        Returns the next offset to commit, or None if nothing was handled.
+        """
+        if self._consumer is None:
+            raise RuntimeError("Notifier not started")
+        consumer = self._consumer
+
+        next_offset = None
+        for record in records:
+            not_before = _header(record.headers, NOT_BEFORE_HEADER)
+            wait = int(not_before) / 1000 - time.time() if not_before else 0
+            if wait > 0:
+                # Refetch this record once it is due; later ones are due even later
+                consumer.seek(tp, record.offset)
+                consumer.pause(tp)
+                self._resume_at[tp] = time.monotonic() + wait
+                break
+
+            try:
+                await self._deliver(record.value, record.key, record.headers)
+            except Exception as e:
+                logger.exception(f"Failed to handle notification at {tp}:{record.offset}: {e}")
+                consumer.seek(tp, record.offset)  # Redeliver on the next fetch
+                break
+            next_offset = record.offset + 1
+
+        return next_offset
+
+    async def _deliver(self, data: bytes, key: bytes | None, headers: Headers | None) -> None:
+        """Send one notification; on failure move it to the next retry tier or the DLQ."""
+        try:
+            message = decode_contact(data, headers)
+        except Exception as e:
+            logger.error(f"Undecodable notification: {e}")
+            await self._publish(
+                self._settings.kafka_dlq_topic, encode_dead_letter(data, str(e), headers)
+            )
+            return
+
+        if await self._db.is_notified(message.id):
+            logger.info(f"Notification already sent: {message.id}")
+            return
+
+        try:
+            success = await send_notification(message)
+        except Exception as e:
+            logger.warning(f"Notification for {message.id} failed: {e}")
+            success = False
+
+        if success:
+            logger.info(f"Notification sent: {message.id}")
+            try:
+                await self._db.mark_notified(message.id)
+            except Exception as e:
+                # Delivered anyway; at worst a later duplicate is sent again
+                logger.error(f"Failed to record notification for {message.id}: {e}")
+            return
+
+        attempt = int(_header(headers, ATTEMPT_HEADER) or 0)
+        if attempt >= len(self._delays):
+            logger.error(f"Failed to send notification for {message.id}, giving up")
+            await self._publish(
+                self._settings.kafka_dlq_topic,
+                encode_dead_letter(data, "telegram_notification_failed", headers),
+            )
+            return
+
+        delay = self._delays[attempt]
+        not_before_ms = int((time.time() + delay) * 1000)
+        await self._publish(
+            self._retry_topics[attempt],
+            data,
+            key=key,
+            headers=retry_headers(headers, attempt + 1, not_before_ms),
+        )
+        logger.warning(f"Notification for {message.id} failed, retrying in {delay}s")
+
+    async def _publish(
+        self,
+        topic: str,
+        value: bytes,
+        key: bytes | None = None,
+        headers: Headers | None = None,
+    ) -> None:
+        if self._producer is None:
+            raise RuntimeError("Notifier producer not available")
+        await self._producer.send_and_wait(topic, value=value, key=key, headers=headers or [])
+
+    async def _commit(self, offsets: dict[TopicPartition, int]) -> None:
+        """Commit handled offsets of partitions still assigned to this worker."""
+        if self._consumer is None:
+            return
+
+        assigned = self._consumer.assignment()
+        offsets = {tp: offset for tp, offset in offsets.items() if tp in assigned}
+        if not offsets:
+            return
+        try:
+            await self._consumer.commit(offsets)
+        except Exception as e:
+            # Worst case the notifications are redelivered
+            logger.error(f"Failed to commit notifier offsets {offsets}: {e}")
@@ -11,6 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api import api_router
 from app.config import get_settings
 from app.services.kafka_producer import kafka_producer
+from app.services.outbox import outbox
 from app.services.rate_limiter import rate_limiter
 from app.telegram.bot import setup_webhook, shutdown_webhook
 
@@ -28,6 +29,7 @@ async def lifespan(app: FastAPI):
     # Connect services
     await rate_limiter.connect()
     await kafka_producer.start()
+    await outbox.start(kafka_producer.send_contact_message)
 
     # Setup Telegram webhook if configured
     if settings.telegram_bot_token and settings.telegram_webhook_url:
@@ -41,7 +43,8 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
 
     await shutdown_webhook()
-    await kafka_producer.stop()
+    await kafka_producer.stop()  # Its last failed deliveries still go to the outbox
+    await outbox.stop()
     await rate_limiter.disconnect()
 
     logger.info("Application shut down successfully")
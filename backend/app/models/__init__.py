@@ -3,6 +3,9 @@ Pydantic models for the application.
 """
 
 from .contact import (
+    ContactBatchItemResult,
+    ContactBatchRequest,
+    ContactBatchResponse,
     ContactChannel,
     ContactFormRequest,
     ContactInfo,
@@ -11,6 +14,9 @@ from .contact import (
 )
 
 __all__ = [
+    "ContactBatchItemResult",
+    "ContactBatchRequest",
+    "ContactBatchResponse",
     "ContactChannel",
     "ContactInfo",
     "ContactFormRequest",
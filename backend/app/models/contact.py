@@ -4,6 +4,7 @@ Contact form models.
 
 from datetime import datetime
 from enum import Enum
+from typing import Any, Literal
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
@@ -92,3 +93,27 @@ class ContactResponse(BaseModel):
     status: str
     message: str
     id: UUID | None = None
+
+
+class ContactBatchRequest(BaseModel):
+    """Bulk contact submission; items are validated individually."""
+
+    items: list[dict[str, Any]] = Field(..., min_length=1)
+
+
+class ContactBatchItemResult(BaseModel):
+    """Outcome of a single item in a bulk submission."""
+
+    index: int
+    status: Literal["queued", "rejected", "failed"]
+    id: UUID | None = None
+    error: str | None = None
+
+
+class ContactBatchResponse(BaseModel):
+    """Response model for bulk contact submission."""
+
+    queued: int
+    rejected: int
+    failed: int
+    results: list[ContactBatchItemResult]
@@ -2,7 +2,21 @@
 Business logic services.
 """
 
+from .admission import AdaptiveConcurrencyLimiter
+from .circuit_breaker import CircuitBreaker
+from .deadline import DeadlineBudget, DeadlineExceededError
+from .idempotency import IdempotencyStore
 from .kafka_producer import KafkaProducerService
+from .outbox import LocalOutbox
 from .rate_limiter import RateLimiter
 
-__all__ = ["KafkaProducerService", "RateLimiter"]
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "DeadlineBudget",
+    "DeadlineExceededError",
+    "IdempotencyStore",
+    "KafkaProducerService",
+    "LocalOutbox",
+    "RateLimiter",
+]
@@ -0,0 +1,108 @@
+"""
+Adaptive admission control (load shedding).
+
+AdaptiveConcurrencyLimiter caps the number of requests in flight and adapts
+the cap with AIMD from the latency of the downstream calls (Redis, Kafka):
+while samples stay under the target latency the limit grows by about one
+per window of requests; a slow or failed sample cuts it by a fixed ratio,
+at most once per target-latency interval so a burst of slow responses does
+not collapse it. Requests over the limit are rejected before they touch
+any dependency.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by downstream latency."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 100,
+        min_limit: int = 10,
+        max_limit: int = 1000,
+        target_latency: float = 0.5,
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self._smoothing = smoothing
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._latency_ewma: dict[str, float] = {}
+
+        # Counters
+        self._accepted = 0
+        self._shed = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently admitted."""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Admit a request if under the limit; every admitted request must be released."""
+        if self._in_flight >= self.limit:
+            self._shed += 1
+            return False
+        self._in_flight += 1
+        self._accepted += 1
+        return True
+
+    def release(self, stage_latencies: dict[str, float], overloaded: bool = False) -> None:
+        """
+        Finish an admitted request and adapt the limit.
+
+        `stage_latencies` are the seconds spent in each downstream call;
+        `overloaded` marks a request that failed because a dependency was
+        slow or unavailable.
+        """
+        self._in_flight -= 1
+
+        for stage, latency in stage_latencies.items():
+            previous = self._latency_ewma.get(stage, latency)
+            self._latency_ewma[stage] = previous + self._smoothing * (latency - previous)
+
+        latency = sum(stage_latencies.values())
+        if overloaded or latency > self.target_latency:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self._decreases += 1
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                logger.warning(
+                    f"{self.name}: downstream latency {latency * 1000:.0f}ms, "
+                    f"concurrency limit lowered to {self.limit}"
+                )
+        elif self._in_flight * 2 >= self._limit:
+            # Only grow while the current limit is actually in use
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def stats(self) -> dict[str, object]:
+        """Limit, usage, shed counts and smoothed per-stage latency (ms)."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "accepted": self._accepted,
+            "shed": self._shed,
+            "decreases": self._decreases,
+            "latency_ms": {
+                stage: round(latency * 1000, 2) for stage, latency in self._latency_ewma.items()
+            },
+        }
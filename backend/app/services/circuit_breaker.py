@@ -0,0 +1,109 @@
+"""
+Circuit breaker for calls to external dependencies.
+"""
+
+import logging
+import time
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Calls flow normally
+    OPEN = "open"  # Calls are skipped until the cool-down expires
+    HALF_OPEN = "half_open"  # A single probe call decides whether to close
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    `allow_request` returns False without touching the dependency. Once
+    `reset_timeout` seconds have passed, exactly one probe is let through:
+    success closes the circuit, failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired open circuit reports half-open)."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if the caller may contact the dependency."""
+        state = self.state
+
+        if state == CircuitState.CLOSED:
+            return True
+
+        if state == CircuitState.HALF_OPEN:
+            now = time.monotonic()
+            # A probe whose caller never reported back (e.g. cancelled)
+            # must not wedge the breaker: let a new one through eventually.
+            if (
+                self._probe_started_at is None
+                or now - self._probe_started_at >= self._reset_timeout
+            ):
+                self._probe_started_at = now
+                logger.info(f"Circuit breaker '{self.name}' half-open, sending probe")
+                return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Report a successful call."""
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit breaker '{self.name}' closed")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        self._failures += 1
+        probe_failed = self._probe_started_at is not None
+        self._probe_started_at = None
+
+        if probe_failed or self._failures >= self._failure_threshold:
+            if self._state != CircuitState.OPEN or probe_failed:
+                logger.warning(
+                    f"Circuit breaker '{self.name}' open for {self._reset_timeout}s "
+                    f"after {self._failures} consecutive failures"
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, str | int | float]:
+        """Breaker state for health/metrics endpoints."""
+        state = self.state
+        return {
+            "state": state.value,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self._failure_threshold,
+            "reset_timeout": self._reset_timeout,
+            "open_for": (
+                round(max(0.0, self._reset_timeout - (time.monotonic() - self._opened_at)), 2)
+                if state == CircuitState.OPEN
+                else 0.0
+            ),
+            "rejected": self.rejected,
+        }
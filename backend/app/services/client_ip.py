@@ -0,0 +1,118 @@
+"""
+Client address resolution and rate limit bucketing.
+"""
+
+import ipaddress
+import logging
+from functools import lru_cache
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+
+
+class TrustedProxies:
+    """
+    Set of trusted proxy networks with constant-time membership checks.
+
+    Networks are stored as masked integers grouped by (version, prefix
+    length), so a lookup masks the address once per distinct prefix length
+    instead of scanning every configured CIDR.
+    """
+
+    def __init__(self, cidrs: list[str]):
+        self._networks: dict[tuple[int, int], set[int]] = {}
+        for cidr in cidrs:
+            try:
+                network = ipaddress.ip_network(cidr, strict=False)
+            except ValueError:
+                logger.warning(f"Ignoring invalid trusted proxy CIDR: {cidr!r}")
+                continue
+            self._networks.setdefault((network.version, network.prefixlen), set()).add(
+                int(network.network_address)
+            )
+
+    def __contains__(self, address: IPAddress) -> bool:
+        bits = address.max_prefixlen
+        value = int(address)
+        for (version, prefixlen), networks in self._networks.items():
+            if version != address.version:
+                continue
+            mask = ((1 << prefixlen) - 1) << (bits - prefixlen)
+            if value & mask in networks:
+                return True
+        return False
+
+
+@lru_cache
+def get_trusted_proxies(cidrs: str) -> TrustedProxies:
+    """Parse the comma-separated trusted proxy setting once per value."""
+    return TrustedProxies([c.strip() for c in cidrs.split(",") if c.strip()])
+
+
+def parse_ip(value: str) -> IPAddress | None:
+    """Parse an address, unwrapping IPv4-mapped IPv6; None if invalid."""
+    try:
+        address = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+    if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+        return address.ipv4_mapped
+    return address
+
+
+def resolve_client_ip(peer: str | None, forwarded_for: str | None, real_ip: str | None) -> str:
+    """
+    Resolve the originating client address.
+
+    Forwarding headers are only honoured when the direct peer is a trusted
+    proxy. X-Forwarded-For is walked right to left, skipping trusted hops;
+    the first untrusted address is the client.
+    """
+    if peer is None:
+        return "unknown"
+
+    trusted = get_trusted_proxies(get_settings().trusted_proxies)
+    peer_ip = parse_ip(peer)
+    if peer_ip is None or peer_ip not in trusted:
+        return peer
+
+    if forwarded_for:
+        client = peer
+        for hop in reversed([h.strip() for h in forwarded_for.split(",") if h.strip()]):
+            client = hop
+            hop_ip = parse_ip(hop)
+            if hop_ip is None or hop_ip not in trusted:
+                break
+        return client
+
+    if real_ip:
+        return real_ip.strip()
+
+    return peer
+
+
+def rate_limit_bucket(client_ip: str) -> str:
+    """
+    Normalise a client address into a rate limit identifier.
+
+    IPv6 addresses are bucketed by RATE_LIMIT_IPV6_PREFIX (a /64 is usually
+    one subscriber) and IPv4 by RATE_LIMIT_IPV4_PREFIX, so rotating through
+    addresses in one allocation neither evades the limit nor creates
+    unbounded Redis keys.
+    """
+    address = parse_ip(client_ip)
+    if address is None:
+        return client_ip[:64]
+
+    settings = get_settings()
+    if address.version == 6:
+        prefix = settings.rate_limit_ipv6_prefix
+    else:
+        prefix = settings.rate_limit_ipv4_prefix
+
+    if prefix >= address.max_prefixlen:
+        return str(address)
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
@@ -0,0 +1,99 @@
+"""
+Per-request deadline budgets.
+
+A request starts a Deadline from a DeadlineBudget and runs each dependency
+call as a named stage. Every stage may only use the time left over from the
+previous ones, optionally capped per stage and minus time reserved for a
+fallback stage; when that is spent, the stage is cancelled and
+DeadlineExceededError is raised. The budget counts timeouts per stage so it
+is visible which dependency consumes the time.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from collections.abc import Awaitable
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request runs out of its time budget."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Deadline exceeded during {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """Time remaining for one request."""
+
+    def __init__(self, budget: "DeadlineBudget"):
+        self._budget = budget
+        self._expires_at = time.monotonic() + budget.seconds if budget.seconds > 0 else float("inf")
+        self.timings: dict[str, float] = {}  # Seconds spent per stage
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    async def run(
+        self,
+        stage: str,
+        awaitable: Awaitable[T],
+        timeout: float | None = None,
+        reserve: float = 0.0,
+    ) -> T:
+        """
+        Await `awaitable` within the remaining budget.
+
+        Args:
+            stage: Name reported in timings and timeout counters
+            awaitable: Dependency call to run
+            timeout: Upper limit for this stage, even with budget left
+            reserve: Seconds of the budget kept for later stages
+        """
+        start = time.monotonic()
+        try:
+            limit = self.remaining() - reserve
+            if timeout is not None:
+                limit = min(limit, timeout)
+            if limit == float("inf"):
+                return await awaitable
+
+            try:
+                if limit <= 0:
+                    raise TimeoutError
+                return await asyncio.wait_for(awaitable, limit)
+            except TimeoutError:
+                if asyncio.iscoroutine(awaitable):
+                    awaitable.close()  # Never started: avoid "was never awaited"
+                self._budget.record_timeout(stage)
+                raise DeadlineExceededError(stage) from None
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.monotonic() - start
+
+
+class DeadlineBudget:
+    """Deadline factory with per-stage timeout counters."""
+
+    def __init__(self, name: str, seconds: float):
+        self.name = name
+        self.seconds = seconds  # 0 disables the deadline
+        self._timeouts: Counter[str] = Counter()
+
+    def start(self) -> Deadline:
+        """Start the clock for a new request."""
+        return Deadline(self)
+
+    def record_timeout(self, stage: str) -> None:
+        self._timeouts[stage] += 1
+        logger.warning(f"{self.name}: deadline of {self.seconds}s exceeded during {stage}")
+
+    def stats(self) -> dict[str, object]:
+        """Budget and timeout counts per stage."""
+        return {"seconds": self.seconds, "timeouts": dict(self._timeouts)}
@@ -0,0 +1,194 @@
+"""
+Idempotency-Key support backed by Redis.
+
+The first request with a key claims it with SET NX (a short-lived "pending"
+marker) and stores its response when done; repeats within the TTL get the
+stored response back without touching Kafka. A repeat that arrives while
+the first request is still in flight waits for its result instead of
+publishing a second message. Each entry records a fingerprint of the
+request body so a key reused for a different request is rejected.
+
+Redis calls share the rate limiter's circuit breaker and have their own
+timeout, so an unreachable Redis degrades to processing without the key
+instead of holding every request until its deadline.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from redis.asyncio import Redis
+
+from app.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+T = TypeVar("T")
+
+
+class IdempotencyConflictError(Exception):
+    """The key is in use by another request (`in_progress`) or another body (`mismatch`)."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Idempotency key conflict: {reason}")
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Response recorded for an idempotency key."""
+
+    status_code: int
+    body: dict[str, Any]
+
+
+def request_fingerprint(payload: str | bytes) -> str:
+    """Stable hash of a request body."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class IdempotencyStore:
+    """Claims, records and replays responses per idempotency key."""
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis | None],
+        breaker: CircuitBreaker | None = None,
+        prefix: str = "idempotency",
+    ):
+        # Resolved on every call so the store follows Sentinel failovers
+        self._redis = redis
+        self._breaker = breaker
+        self._prefix = prefix
+        self._settings = get_settings()
+        self._replayed = 0
+        self._waited = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def _client(self) -> Redis | None:
+        """Redis connection, or None while it is missing or the breaker is open."""
+        redis = self._redis()
+        if redis is None or (self._breaker is not None and not self._breaker.allow_request()):
+            return None
+        return redis
+
+    async def _call(self, command: Awaitable[T]) -> T:
+        """Run one Redis command within its timeout and report the outcome to the breaker."""
+        try:
+            result = await asyncio.wait_for(
+                command, self._settings.idempotency_redis_timeout_seconds
+            )
+        except Exception:
+            if self._breaker is not None:
+                self._breaker.record_failure()
+            raise
+        if self._breaker is not None:
+            self._breaker.record_success()
+        return result
+
+    async def begin(
+        self, key: str, fingerprint: str, max_wait: float | None = None
+    ) -> StoredResponse | None:
+        """
+        Claim `key` for this request.
+
+        Returns None when the caller owns the key and should process the
+        request, or the stored response to replay. Raises IdempotencyConflictError
+        if the key belongs to a different request body or is still in flight
+        after `max_wait` (default IDEMPOTENCY_WAIT_SECONDS). Without Redis the
+        request is processed normally.
+        """
+        redis = self._client()
+        if redis is None:
+            return None
+
+        name = self._key(key)
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        lock_ms = int(self._settings.idempotency_lock_seconds * 1000)
+        poll = self._settings.idempotency_poll_interval_seconds
+        if max_wait is None:
+            max_wait = self._settings.idempotency_wait_seconds
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + max_wait
+        waited = False
+
+        try:
+            while True:
+                if await self._call(redis.set(name, pending, nx=True, px=lock_ms)):
+                    return None
+
+                raw = await self._call(redis.get(name))
+                if raw is None:
+                    continue  # Released or expired in between: try to claim again
+
+                entry = json.loads(raw)
+                if entry["fingerprint"] != fingerprint:
+                    raise IdempotencyConflictError("mismatch")
+
+                if entry["state"] == "done":
+                    self._replayed += 1
+                    return StoredResponse(entry["status_code"], entry["body"])
+
+                # Same request still in flight: wait for its outcome
+                if not waited:
+                    waited = True
+                    self._waited += 1
+                left = give_up_at - loop.time()
+                if left <= 0:
+                    raise IdempotencyConflictError("in_progress")
+                await asyncio.sleep(min(poll, left))
+
+        except IdempotencyConflictError:
+            raise
+        except Exception as e:
+            logger.warning(f"Idempotency check failed, processing without it: {e}")
+            return None
+
+    async def complete(self, key: str, fingerprint: str, status_code: int, body: dict) -> None:
+        """Record the response for replay within the TTL."""
+        redis = self._client()
+        if redis is None:
+            return
+
+        entry = json.dumps(
+            {"state": "done", "fingerprint": fingerprint, "status_code": status_code, "body": body}
+        )
+        try:
+            await self._call(
+                redis.set(
+                    self._key(key), entry, px=int(self._settings.idempotency_ttl_seconds * 1000)
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store idempotent response for {key}: {e}")
+
+    async def release(self, key: str) -> None:
+        """Drop a pending claim after a failed request so a retry can run."""
+        redis = self._client()
+        if redis is None:
+            return
+
+        try:
+            await self._call(redis.delete(self._key(key)))
+        except Exception as e:
+            logger.warning(f"Failed to release idempotency key {key}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Replayed responses and requests that waited for an in-flight duplicate."""
+        return {"replayed": self._replayed, "waited": self._waited}
+
+
+# Global store, sharing the rate limiter's Redis connection and circuit breaker
+idempotency_store = IdempotencyStore(lambda: rate_limiter.client, rate_limiter.breaker)
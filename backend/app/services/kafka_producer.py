@@ -2,13 +2,17 @@
 Kafka producer service for sending contact messages.
 """
 
-import json
+import asyncio
 import logging
+from collections import deque
+from functools import partial
 
-from aiokafka import AIOKafkaProducer
+from aiokafka import AIOKafkaProducer, TopicPartition
 
 from app.config import get_settings
+from app.kafka.codec import encode_contact, wire_headers
 from app.models import ContactMessage
+from app.services.outbox import outbox
 
 logger = logging.getLogger(__name__)
 
@@ -16,32 +20,131 @@ logger = logging.getLogger(__name__)
 class KafkaProducerService:
     """Async Kafka producer for contact messages."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._producer: AIOKafkaProducer | None = None
         self._settings = get_settings()
 
+        # Background delivery (async-ack mode)
+        self._pending = 0
+        self._delivered = 0
+        self._failed_total = 0
+        self._dropped_total = 0
+        self._failed: deque[ContactMessage] = deque(maxlen=self._settings.kafka_failed_buffer_size)
+        self._replay_task: asyncio.Task | None = None
+        self._outbox_writes: set[asyncio.Task] = set()
+
+        # Topic metadata warm-up
+        self._ready = False
+        self._warmup_error: str | None = None
+        self._warmup_task: asyncio.Task | None = None
+        self._topic_partitions: dict[str, int] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Whether topic metadata is loaded and partition leaders are connected."""
+        return self._ready
+
     async def start(self) -> None:
         """Start the Kafka producer."""
         if self._producer is not None:
             return
 
+        options = self._settings.kafka_producer_options
         self._producer = AIOKafkaProducer(
             bootstrap_servers=self._settings.kafka_bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
             key_serializer=lambda k: k.encode("utf-8") if k else None,
             acks="all",  # Wait for all replicas
             enable_idempotence=True,  # Exactly-once semantics
+            **options,
         )
         await self._producer.start()
-        logger.info("Kafka producer started")
+        logger.info(f"Kafka producer started ({self._settings.kafka_producer_profile}: {options})")
+
+        # Pay the metadata fetch and leader connections before the first request without
+        # blocking startup; readiness is reported through `ready`
+        self._warmup_task = asyncio.create_task(self._warm_up_until_ready())
+
+    async def warm_up(self) -> None:
+        """
+        Prefetch metadata for the contact and DLQ topics and connect to their leaders.
+
+        Raises if a topic is missing or has an unexpected partition count.
+        """
+        expected = {
+            self._settings.kafka_topic: self._settings.kafka_topic_partitions,
+            self._settings.kafka_dlq_topic: self._settings.kafka_dlq_topic_partitions,
+        }
+
+        if self._producer is None:
+            raise RuntimeError("Kafka producer not started")
+        producer = self._producer
+
+        client = producer.client
+        leaders = set()
+        for topic, expected_partitions in expected.items():
+            partitions = await producer.partitions_for(topic)
+            if expected_partitions and len(partitions) != expected_partitions:
+                raise RuntimeError(
+                    f"Topic {topic} has {len(partitions)} partitions, "
+                    f"expected {expected_partitions}"
+                )
+            self._topic_partitions[topic] = len(partitions)
+            for partition in partitions:
+                leader = client.cluster.leader_for_partition(TopicPartition(topic, partition))
+                if leader is not None and leader >= 0:
+                    leaders.add(leader)
+
+        await asyncio.gather(*(client.ready(node_id) for node_id in leaders))
+
+        self._ready = True
+        self._warmup_error = None
+        logger.info(
+            f"Kafka metadata warmed up: {self._topic_partitions}, leaders {sorted(leaders)}"
+        )
+
+    async def _warm_up_until_ready(self) -> None:
+        """Repeat the warm-up until it succeeds."""
+        while True:
+            try:
+                await self.warm_up()
+                return
+            except Exception as e:
+                self._warmup_error = str(e) or type(e).__name__
+                logger.warning(f"Kafka warm-up failed: {self._warmup_error}")
+            await asyncio.sleep(self._settings.kafka_warmup_retry_seconds)
 
     async def stop(self) -> None:
         """Stop the Kafka producer."""
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+            self._warmup_task = None
+        self._ready = False
+
         if self._producer is not None:
+            # stop() flushes buffered batches, so delivery callbacks still fire
             await self._producer.stop()
             self._producer = None
             logger.info("Kafka producer stopped")
 
+        # Failed deliveries reported during the flush are still being journaled
+        if self._outbox_writes:
+            await asyncio.gather(*self._outbox_writes, return_exceptions=True)
+
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            try:
+                await self._replay_task
+            except asyncio.CancelledError:
+                pass
+            self._replay_task = None
+
+        if self._failed:
+            logger.warning(f"{len(self._failed)} undelivered messages dropped on shutdown")
+
     async def send_contact_message(self, message: ContactMessage) -> bool:
         """
         Send a contact message to Kafka.
@@ -53,14 +156,12 @@ class KafkaProducerService:
             return False
 
         try:
-            # Serialize the message
-            message_dict = message.model_dump(mode="json")
-
             # Send to Kafka
             await self._producer.send_and_wait(
                 topic=self._settings.kafka_topic,
-                value=message_dict,
+                value=encode_contact(message, self._settings.kafka_wire_format),
                 key=str(message.id),
+                headers=wire_headers(self._settings.kafka_wire_format),
             )
 
             logger.info(f"Contact message sent to Kafka: {message.id}")
@@ -70,6 +171,151 @@ class KafkaProducerService:
             logger.exception(f"Failed to send message to Kafka: {e}")
             return False
 
+    async def send_contact_messages(self, messages: list[ContactMessage]) -> list[bool]:
+        """
+        Send several contact messages as one producer batch.
+
+        All messages are appended to the producer buffer before any delivery
+        is awaited, so they share batches and broker round trips.
+        Returns a success flag per message, in order.
+        """
+        if self._producer is None:
+            logger.error("Kafka producer not started")
+            return [False] * len(messages)
+
+        wire_format = self._settings.kafka_wire_format
+        deliveries = []
+        for message in messages:
+            try:
+                deliveries.append(
+                    await self._producer.send(
+                        topic=self._settings.kafka_topic,
+                        value=encode_contact(message, wire_format),
+                        key=str(message.id),
+                        headers=wire_headers(wire_format),
+                    )
+                )
+            except Exception as e:
+                logger.exception(f"Failed to buffer message for Kafka: {e}")
+                deliveries.append(None)
+
+        results = []
+        for message, delivery in zip(messages, deliveries, strict=True):
+            if delivery is None:
+                results.append(False)
+                continue
+            try:
+                await delivery
+                results.append(True)
+            except Exception as e:
+                logger.error(f"Failed to send message to Kafka: {message.id}: {e}")
+                results.append(False)
+
+        logger.info(f"Contact batch sent to Kafka: {sum(results)}/{len(messages)} delivered")
+        return results
+
+    async def enqueue_contact_message(self, message: ContactMessage) -> bool:
+        """
+        Hand a contact message to the producer buffer without waiting for the broker.
+
+        Returns True once the message is accepted into the buffer. Delivery is
+        confirmed in the background; failed messages are kept for replay.
+        """
+        if self._producer is None:
+            logger.error("Kafka producer not started")
+            return False
+
+        try:
+            future = await self._producer.send(
+                topic=self._settings.kafka_topic,
+                value=encode_contact(message, self._settings.kafka_wire_format),
+                key=str(message.id),
+                headers=wire_headers(self._settings.kafka_wire_format),
+            )
+        except Exception as e:
+            logger.exception(f"Failed to buffer message for Kafka: {e}")
+            return False
+
+        self._pending += 1
+        future.add_done_callback(partial(self._on_delivery, message))
+        return True
+
+    def _on_delivery(self, message: ContactMessage, future: asyncio.Future) -> None:
+        """Record the outcome of a background delivery."""
+        self._pending -= 1
+
+        if future.cancelled() or future.exception() is not None:
+            error = "cancelled" if future.cancelled() else future.exception()
+            self._failed_total += 1
+            logger.error(f"Background delivery failed for {message.id}: {error}")
+
+            # Prefer the durable outbox over the in-memory replay buffer
+            if outbox.enabled:
+                task = asyncio.create_task(outbox.append(message))
+                self._outbox_writes.add(task)
+                task.add_done_callback(self._outbox_writes.discard)
+            else:
+                self._keep_failed(message)
+            return
+
+        self._delivered += 1
+        logger.info(f"Contact message delivered to Kafka: {message.id}")
+
+        # The broker is reachable again: replay what failed earlier
+        if self._failed and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.create_task(self.replay_failed())
+
+    def _keep_failed(self, message: ContactMessage, *, front: bool = False) -> None:
+        """Buffer an undelivered message for replay, counting what a full buffer evicts."""
+        if len(self._failed) == self._failed.maxlen:
+            evicted = self._failed[-1] if front else self._failed[0]
+            self._dropped_total += 1
+            logger.warning(
+                f"Replay buffer full ({self._failed.maxlen}), dropping undelivered "
+                f"message {evicted.id} ({self._dropped_total} dropped so far)"
+            )
+        if front:
+            self._failed.appendleft(message)
+        else:
+            self._failed.append(message)
+
+    async def replay_failed(self) -> int:
+        """
+        Re-send messages whose background delivery failed.
+
+        Stops at the first failure and keeps the rest for the next attempt.
+        Returns the number of messages delivered.
+        """
+        replayed = 0
+        while self._failed:
+            message = self._failed.popleft()
+            if not await self.send_contact_message(message):
+                self._keep_failed(message, front=True)
+                break
+            replayed += 1
+
+        if replayed:
+            logger.info(f"Replayed {replayed} undelivered contact messages")
+        return replayed
+
+    def warmup_status(self) -> dict[str, object]:
+        """Warm-up state for the readiness probe."""
+        return {
+            "ready": self._ready,
+            "partitions": dict(self._topic_partitions),
+            "error": self._warmup_error,
+        }
+
+    def stats(self) -> dict[str, int]:
+        """Counters for messages accepted but not (yet) delivered."""
+        return {
+            "pending": self._pending,
+            "delivered": self._delivered,
+            "failed": self._failed_total,
+            "awaiting_replay": len(self._failed),
+            "dropped": self._dropped_total,
+        }
+
 
 # Global producer instance
 kafka_producer = KafkaProducerService()
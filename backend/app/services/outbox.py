@@ -0,0 +1,240 @@
+"""
+Durable local outbox for contact messages that could not reach Kafka.
+
+Messages are appended to a SQLite journal on local disk. Concurrent appends
+are group-committed: every waiting caller shares one transaction, so a burst
+of failures costs a single fsync. A background relay drains the journal to
+Kafka once the producer recovers, keeping the original message ids so the
+consumer can drop duplicates.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from app.config import get_settings
+from app.models import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+SendFunc = Callable[[ContactMessage], Awaitable[bool]]
+
+
+class LocalOutbox:
+    """Append-only SQLite journal with group commit and a Kafka relay."""
+
+    def __init__(self):
+        self._settings = get_settings()
+        self._db: sqlite3.Connection | None = None
+        self._pending: list[tuple[ContactMessage, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._relay_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+        # Counters
+        self._appended = 0
+        self._commits = 0
+        self._relayed = 0
+        self._relay_rate = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the outbox has been opened."""
+        return self._db is not None
+
+    async def start(self, send: SendFunc) -> None:
+        """Open the journal and start relaying it through `send`."""
+        if self._db is not None or not self._settings.outbox_enabled:
+            return
+
+        path = Path(self._settings.outbox_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await asyncio.to_thread(self._open, path)
+        self._relay_task = asyncio.create_task(self._relay_loop(send))
+
+        depth = await self.depth()
+        logger.info(f"Outbox opened at {path} ({depth} messages waiting)")
+
+    async def stop(self) -> None:
+        """Stop the relay and close the journal after pending appends are durable."""
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+
+        if self._flush_task is not None:
+            await self._flush_task
+
+        if self._db is not None:
+            await asyncio.to_thread(self._db.close)
+            self._db = None
+            logger.info("Outbox closed")
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")  # fsync on every commit
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " id TEXT NOT NULL UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        return db
+
+    async def append(self, message: ContactMessage) -> bool:
+        """
+        Durably store a message for later delivery.
+
+        Returns True once the message has been committed to disk.
+        """
+        if self._db is None:
+            logger.error("Outbox not started")
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+        try:
+            await future
+        except Exception as e:
+            logger.exception(f"Failed to write message to outbox: {e}")
+            return False
+
+        return True
+
+    async def _flush(self) -> None:
+        """Commit every queued append in one transaction per round."""
+        # Let callers arriving in the same tick join this commit
+        await asyncio.sleep(self._settings.outbox_commit_delay_ms / 1000)
+
+        while self._pending:
+            batch, self._pending = self._pending, []
+            rows = [
+                (str(message.id), message.model_dump_json(), time.time()) for message, _ in batch
+            ]
+
+            try:
+                async with self._lock:
+                    await asyncio.to_thread(self._insert, rows)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():  # The caller may have been cancelled
+                        future.set_exception(e)
+                continue
+
+            self._appended += len(batch)
+            self._commits += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("Outbox not started")
+        return self._db
+
+    def _insert(self, rows: list[tuple[str, str, float]]) -> None:
+        db = self._connection()
+        with db:
+            # Re-appending a message id keeps the original entry
+            db.executemany(
+                "INSERT OR IGNORE INTO outbox (id, payload, created_at) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    async def depth(self) -> int:
+        """Number of messages waiting to be relayed."""
+        if self._db is None:
+            return 0
+        db = self._db
+        async with self._lock:
+            row = await asyncio.to_thread(
+                lambda: db.execute("SELECT COUNT(*) FROM outbox").fetchone()
+            )
+        return int(row[0])
+
+    async def _read_batch(self, limit: int) -> list[tuple[int, ContactMessage]]:
+        db = self._connection()
+        async with self._lock:
+            rows = await asyncio.to_thread(
+                lambda: db.execute(
+                    "SELECT seq, payload FROM outbox ORDER BY seq LIMIT ?", (limit,)
+                ).fetchall()
+            )
+        return [(seq, ContactMessage.model_validate_json(payload)) for seq, payload in rows]
+
+    async def _delete(self, seqs: list[int]) -> None:
+        db = self._connection()
+
+        def delete() -> None:
+            with db:
+                db.executemany("DELETE FROM outbox WHERE seq = ?", [(s,) for s in seqs])
+
+        async with self._lock:
+            await asyncio.to_thread(delete)
+
+    async def relay_once(self, send: SendFunc) -> int:
+        """
+        Forward one batch of stored messages through `send`, oldest first.
+
+        Stops at the first failure so ordering is kept. Returns the number of
+        messages delivered and removed from the journal.
+        """
+        batch = await self._read_batch(self._settings.outbox_relay_batch_size)
+        if not batch:
+            return 0
+
+        start = time.perf_counter()
+        delivered: list[int] = []
+        for seq, message in batch:
+            if not await send(message):
+                break
+            delivered.append(seq)
+
+        if delivered:
+            await self._delete(delivered)
+            self._relayed += len(delivered)
+            self._relay_rate = len(delivered) / max(time.perf_counter() - start, 1e-6)
+            logger.info(f"Relayed {len(delivered)} messages from outbox")
+
+        return len(delivered)
+
+    async def _relay_loop(self, send: SendFunc) -> None:
+        """Drain the journal, backing off while Kafka is unavailable."""
+        interval = self._settings.outbox_relay_interval_seconds
+        while True:
+            try:
+                # Keep going while full batches are being delivered
+                while await self.relay_once(send) >= self._settings.outbox_relay_batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Outbox relay failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def stats(self) -> dict[str, int | float | bool]:
+        """Outbox depth and relay throughput."""
+        return {
+            "enabled": self.enabled,
+            "depth": await self.depth(),
+            "appended": self._appended,
+            "commits": self._commits,
+            "relayed": self._relayed,
+            "relay_messages_per_sec": round(self._relay_rate, 1),
+        }
+
+
+# Global outbox instance
+outbox = LocalOutbox()
@@ -2,15 +2,326 @@
 Redis Sentinel-based rate limiter with automatic failover.
 """
 
+import asyncio
+import hashlib
 import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
 
 import redis.asyncio as redis
-from redis.asyncio.sentinel import Sentinel
+from redis.asyncio.sentinel import MasterNotFoundError, Sentinel
+from redis.commands.core import AsyncScript
+from redis.exceptions import NoScriptError
 
 from app.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Sliding window counters for any number of windows, kept in one hash per
+# identifier with a single expiry. Each window stores three fields
+# ("<window>:s" bucket start, ":c" current count, ":p" previous count) and
+# estimates the sliding count as prev * (unelapsed fraction) + current, so
+# memory is constant per window regardless of the limit. Every window is
+# checked and updated in a single atomic server-side call; a request is
+# allowed only if all windows allow it.
+#
+# KEYS[1] - rate limit key
+# ARGV    - (limit, window_ms) pairs
+#
+# Returns {allowed (0/1), limit, remaining, reset_after_ms, window_ms} for the
+# most restrictive window
+SLIDING_WINDOW_SCRIPT = """
+local unpack = unpack or table.unpack
+local key = KEYS[1]
+
+local key_type = redis.call('TYPE', key)['ok']
+if key_type ~= 'hash' and key_type ~= 'none' then
+    redis.call('DEL', key)
+end
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local windows = {}
+local fields = {}
+for i = 1, #ARGV, 2 do
+    local w = tonumber(ARGV[i + 1])
+    table.insert(windows, {limit = tonumber(ARGV[i]), size = w})
+    table.insert(fields, w .. ':s')
+    table.insert(fields, w .. ':c')
+    table.insert(fields, w .. ':p')
+end
+
+local stored = redis.call('HMGET', key, unpack(fields))
+local allowed = 1
+local max_size = 0
+
+for i, win in ipairs(windows) do
+    local start = math.floor(now / win.size) * win.size
+    local s = tonumber(stored[i * 3 - 2]) or start
+    local c = tonumber(stored[i * 3 - 1]) or 0
+    local p = tonumber(stored[i * 3]) or 0
+
+    if s ~= start then
+        if s == start - win.size then p = c else p = 0 end
+        c = 0
+    end
+
+    win.start, win.c, win.p = start, c, p
+    win.elapsed = now - start
+    if p * (win.size - win.elapsed) / win.size + c + 1 > win.limit then
+        allowed = 0
+    end
+    if win.size > max_size then max_size = win.size end
+end
+
+local update = {}
+local best = nil
+for _, win in ipairs(windows) do
+    if allowed == 1 then win.c = win.c + 1 end
+    table.insert(update, win.size .. ':s')
+    table.insert(update, win.start)
+    table.insert(update, win.size .. ':c')
+    table.insert(update, win.c)
+    table.insert(update, win.size .. ':p')
+    table.insert(update, win.p)
+
+    local estimate = win.p * (win.size - win.elapsed) / win.size + win.c
+    win.remaining = math.max(0, math.floor(win.limit - estimate))
+
+    -- Time until one more request fits in this window
+    local wait
+    if win.c + 1 > win.limit then
+        -- Current bucket is full: it must become the previous bucket and decay
+        wait = (win.size - win.elapsed)
+            + math.ceil(win.size * (1 - (win.limit - 1) / win.c))
+    elseif win.p > 0 and estimate + 1 > win.limit then
+        wait = math.ceil(win.size * (1 - (win.limit - 1 - win.c) / win.p)) - win.elapsed
+    else
+        wait = win.size - win.elapsed
+    end
+    win.wait = math.max(0, wait)
+
+    if best == nil
+        or win.remaining < best.remaining
+        or (win.remaining == best.remaining and win.wait > best.wait) then
+        best = win
+    end
+end
+
+redis.call('HSET', key, unpack(update))
+redis.call('PEXPIRE', key, max_size * 2)
+
+return {allowed, best.limit, best.remaining, best.wait, best.size}
+"""
+
+# EVALSHA digest of the script, as computed by SCRIPT LOAD
+SLIDING_WINDOW_SHA = hashlib.sha1(SLIDING_WINDOW_SCRIPT.encode()).hexdigest()
+
+
+def _window_remaining(fields: dict[str, str], limit: int, window_ms: int, now_ms: int) -> int:
+    """Read-only Python mirror of the script's sliding window estimate."""
+    start = now_ms // window_ms * window_ms
+    bucket_start = int(fields.get(f"{window_ms}:s", start))
+    current = float(fields.get(f"{window_ms}:c", 0))
+    previous = float(fields.get(f"{window_ms}:p", 0))
+
+    if bucket_start != start:
+        previous = current if bucket_start == start - window_ms else 0
+        current = 0
+
+    estimate = previous * (window_ms - (now_ms - start)) / window_ms + current
+    return max(0, math.floor(limit - estimate))
+
+
+@dataclass(frozen=True)
+class RateLimitVerdict:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the window frees a slot
+    window: int = 0  # Window (seconds) the limit/remaining figures refer to
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+    @property
+    def retry_after(self) -> int:
+        """Whole seconds a denied client should wait before retrying."""
+        return max(1, math.ceil(self.reset_after))
+
+    def headers(self) -> dict[str, str]:
+        """Standard X-RateLimit-* headers (plus Retry-After when denied)."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class LocalDenyCache:
+    """
+    Bounded in-process LRU of identifiers known to be rate limited.
+
+    Entries are only added once Redis reports the window as exhausted and
+    expire at the window's reset time, so a hit is always a correct denial
+    that can be answered without any network I/O.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, RateLimitVerdict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, identifier: str) -> RateLimitVerdict | None:
+        """Return a denial verdict if the identifier is known to be limited."""
+        entry = self._entries.get(identifier)
+        if entry is not None:
+            blocked_until, verdict = entry
+            remaining = blocked_until - time.monotonic()
+            if remaining > 0:
+                self._entries.move_to_end(identifier)
+                self.hits += 1
+                return replace(verdict, allowed=False, remaining=0, reset_after=remaining)
+            del self._entries[identifier]
+
+        self.misses += 1
+        return None
+
+    def deny(self, identifier: str, verdict: RateLimitVerdict) -> None:
+        """Remember an exhausted verdict until its window frees a slot."""
+        if verdict.reset_after <= 0 or self._max_size <= 0:
+            return
+
+        self._entries[identifier] = (time.monotonic() + verdict.reset_after, verdict)
+        self._entries.move_to_end(identifier)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Hit/miss counters; hits are Redis round trips avoided."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# A pending script call: (keys, args)
+ScriptCall = tuple[list[str], list[Any]]
+
+
+class RateLimitBatcher:
+    """
+    Coalesces concurrent script calls into one pipelined Redis round trip.
+
+    Calls arriving within `max_delay` seconds of the first queued call (or in
+    the same event loop tick when `max_delay` is 0) are flushed together; a
+    full batch of `max_size` calls is flushed immediately. Each caller awaits
+    its own result.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[list[ScriptCall]], Awaitable[list[Any]]],
+        max_size: int,
+        max_delay: float,
+    ):
+        self._execute = execute
+        self._max_size = max(1, max_size)
+        self._max_delay = max(0.0, max_delay)
+        self._pending: list[tuple[list[str], list[Any], asyncio.Future]] = []
+        self._timer: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.calls = 0
+
+    async def submit(self, keys: list[str], args: list[Any]) -> Any:
+        """Queue a script call and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((keys, args, future))
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            if self._max_delay:
+                self._timer = loop.call_later(self._max_delay, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Send everything queued so far as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[list[str], list[Any], asyncio.Future]]) -> None:
+        """Execute a batch and hand each caller its own result."""
+        self.batches += 1
+        self.calls += len(batch)
+
+        try:
+            results = await self._execute([(keys, args) for keys, args, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue  # Caller went away (e.g. request cancelled)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, int | float]:
+        """Batch counters; avg_batch_size is round trips saved per call."""
+        return {
+            "batches": self.batches,
+            "calls": self.calls,
+            "avg_batch_size": round(self.calls / self.batches, 2) if self.batches else 0.0,
+            "max_size": self._max_size,
+            "max_delay_ms": self._max_delay * 1000,
+        }
+
 
 class RateLimiter:
     """
@@ -18,91 +329,315 @@ class RateLimiter:
 
     Features:
     - Automatic failover when master fails
-    - Sliding window rate limiting
-    - Graceful degradation on Redis errors
+    - Optional replica reads for introspection (lag-checked, master fallback)
+    - Sliding window rate limiting over several windows (atomic Lua script,
+      one round trip, one hash per identifier)
+    - In-process deny cache answering repeat denials without Redis
+    - Optional coalescing of concurrent checks into pipelined round trips
+    - Graceful degradation on Redis errors, with a circuit breaker so an
+      unreachable Redis is skipped instead of timing out on every request
     """
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._redis: redis.Redis | None = None
         self._sentinel: Sentinel | None = None
+        self._replica: redis.Redis | None = None
+        self._replica_fresh = False
+        self._replica_checked_at = 0.0
+        self._replica_reads = 0
+        self._replica_fallbacks = 0
         self._settings = get_settings()
+        self._script: AsyncScript | None = None
+        self._script_client: redis.Redis | None = None
+        self._local = LocalDenyCache(self._settings.rate_limit_local_cache_size)
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=self._settings.redis_breaker_failure_threshold,
+            reset_timeout=self._settings.redis_breaker_reset_timeout,
+        )
+        self._batcher: RateLimitBatcher | None = None
+        if self._settings.rate_limit_batch_enabled:
+            self._batcher = RateLimitBatcher(
+                self._execute_batch,
+                max_size=self._settings.rate_limit_batch_max_size,
+                max_delay=self._settings.rate_limit_batch_max_delay_ms / 1000,
+            )
 
-    async def connect(self) -> None:
-        """Connect to Redis via Sentinel cluster."""
-        if self._redis is not None:
-            return
+    @property
+    def client(self) -> redis.Redis | None:
+        """Redis master connection, None until connected."""
+        return self._redis
 
+    @staticmethod
+    def _key(identifier: str) -> str:
+        """Build the Redis key for an identifier."""
+        return f"ratelimit:contact:{identifier}"
+
+    def _sliding_window(self) -> AsyncScript:
+        """
+        Get the registered sliding window script.
+
+        The script is registered once per client; redis-py calls it via
+        EVALSHA and transparently reloads it on NOSCRIPT (e.g. after failover).
+        """
+        if self._script is None or self._script_client is not self._redis:
+            assert self._redis is not None
+            self._script = self._redis.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = self._redis
+        return self._script
+
+    async def _execute_batch(self, calls: list[ScriptCall]) -> list[Any]:
+        """Run many sliding window calls in a single non-transactional pipeline."""
+        assert self._redis is not None
+
+        for attempt in range(2):
+            pipe = self._redis.pipeline(transaction=False)
+            for keys, args in calls:
+                pipe.evalsha(SLIDING_WINDOW_SHA, len(keys), *keys, *args)
+            results: list[Any] = await pipe.execute(raise_on_error=False)
+
+            if attempt == 0 and any(isinstance(r, NoScriptError) for r in results):
+                # Script cache was flushed (restart/failover): load and retry once
+                await self._redis.script_load(SLIDING_WINDOW_SCRIPT)
+                continue
+            break
+
+        return results
+
+    async def _evaluate(self, identifier: str) -> RateLimitVerdict:
+        """Record a request and evaluate every window in one round trip."""
+        keys = [self._key(identifier)]
+        args = [
+            value
+            for limit, window in self._settings.rate_limit_windows_list
+            for value in (limit, window * 1000)
+        ]
+
+        if self._batcher is not None:
+            result = await self._batcher.submit(keys, args)
+        else:
+            result = await self._sliding_window()(keys=keys, args=args)
+
+        allowed, limit, remaining, reset_after_ms, window_ms = result
+        return RateLimitVerdict(
+            allowed=bool(allowed),
+            limit=int(limit),
+            remaining=max(0, int(remaining)),
+            # Computed against Redis' own clock, so host clock skew does not matter
+            reset_after=max(0, int(reset_after_ms)) / 1000,
+            window=int(window_ms) // 1000,
+        )
+
+    def _fail_open(self) -> RateLimitVerdict:
+        """Verdict used when Redis cannot be consulted."""
+        limit, window = self._settings.rate_limit_windows_list[0]
+        return RateLimitVerdict(
+            allowed=True, limit=limit, remaining=limit, reset_after=0, window=window
+        )
+
+    def fail_open_after_timeout(self) -> RateLimitVerdict:
+        """Verdict for a check the caller gave up on; counts as a Redis failure."""
+        self.breaker.record_failure()
+        return self._fail_open()
+
+    async def _query_sentinel(self, host: str, port: int) -> tuple[str, int]:
+        """Ask a single sentinel for the current master address."""
+        client = redis.Redis(
+            host=host,
+            port=port,
+            socket_timeout=self._settings.redis_socket_timeout,
+            socket_connect_timeout=self._settings.redis_socket_connect_timeout,
+            decode_responses=True,
+        )
         try:
-            # Try direct connection to master first (fallback if Sentinel has issues)
-            # This is useful when Sentinel configuration is outdated
-            logger.info("Attempting direct connection to Redis master...")
+            address = await client.sentinel_get_master_addr_by_name(
+                self._settings.redis_sentinel_master
+            )
+        finally:
+            await client.close()
 
-            self._redis = redis.Redis(
-                host="redis-master",
-                port=6379,
+        if not address:
+            raise MasterNotFoundError(
+                f"Sentinel {host}:{port} does not know master "
+                f"{self._settings.redis_sentinel_master!r}"
+            )
+        return address[0], int(address[1])
+
+    async def _discover_master(self) -> tuple[tuple[str, int], list[tuple[str, int]]]:
+        """
+        Query all sentinels concurrently and elect the master address.
+
+        An address is accepted as soon as a majority of the configured
+        sentinels report it; if no majority forms, the address with the
+        most votes among the sentinels that answered wins.
+
+        Returns:
+            Tuple of (master address, sentinel nodes with the ones that voted
+            for it first, then the other responders, unresponsive nodes last)
+        """
+        nodes = self._settings.redis_sentinel_hosts_list
+        quorum = len(nodes) // 2 + 1
+        tasks = {
+            asyncio.create_task(self._query_sentinel(host, port)): (host, port)
+            for host, port in nodes
+        }
+        voters: dict[tuple[str, int], list[tuple[str, int]]] = {}
+        errors: list[str] = []
+
+        def ordered(address: tuple[str, int]) -> list[tuple[str, int]]:
+            # master_for re-runs discovery and trusts the first sentinel that
+            # answers, so the elected address's voters must be asked first
+            others = [n for other, voted in voters.items() if other != address for n in voted]
+            responded = voters[address] + others
+            return responded + [n for n in nodes if n not in responded]
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = tasks[task]
+                    if task.exception() is not None:
+                        errors.append(f"{node[0]}:{node[1]} - {task.exception()!r}")
+                        continue
+
+                    address = task.result()
+                    voters.setdefault(address, []).append(node)
+                    if len(voters[address]) >= quorum:
+                        return address, ordered(address)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not voters:
+            raise MasterNotFoundError(
+                f"No master found for {self._settings.redis_sentinel_master!r}: "
+                f"{', '.join(errors)}"
+            )
+
+        address = max(voters, key=lambda a: len(voters[a]))
+        logger.warning(f"Sentinels did not reach a majority, using {address}: voters={voters}")
+        return address, ordered(address)
+
+    async def _connect_sentinel(self) -> tuple[redis.Redis, Sentinel, str]:
+        """Discover the master via Sentinel and return a failover-aware client."""
+        address, ordered_nodes = await self._discover_master()
+
+        # Sentinels that elected the master first, so master_for's own
+        # (sequential) discovery agrees with the vote and never waits on a
+        # dead node
+        sentinel = Sentinel(
+            ordered_nodes,
+            socket_timeout=self._settings.redis_socket_timeout,
+            socket_connect_timeout=self._settings.redis_socket_connect_timeout,
+        )
+        # Password is for the Redis master; Sentinel itself needs none
+        client = sentinel.master_for(
+            self._settings.redis_sentinel_master,
+            socket_timeout=self._settings.redis_socket_timeout,
+            password=self._settings.redis_password,
+            db=self._settings.redis_db,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        try:
+            await client.ping()
+        except BaseException:  # Also close when cancelled after losing the race
+            await client.close()
+            raise
+
+        if self._settings.redis_replica_reads:
+            # Rotates over replicas, falling back to the master if none exist
+            self._replica = sentinel.slave_for(
+                self._settings.redis_sentinel_master,
+                socket_timeout=self._settings.redis_socket_timeout,
                 password=self._settings.redis_password,
                 db=self._settings.redis_db,
-                socket_timeout=self._settings.redis_socket_timeout,
-                socket_connect_timeout=self._settings.redis_socket_connect_timeout,
                 encoding="utf-8",
                 decode_responses=True,
             )
 
-            # Test connection
-            await self._redis.ping()
+        return client, sentinel, f"sentinel master={address[0]}:{address[1]}"
+
+    async def _connect_direct(self, host_port: str) -> tuple[redis.Redis, None, str]:
+        """Connect straight to a Redis host (no failover)."""
+        host, _, port = host_port.partition(":")
+        client = redis.Redis(
+            host=host,
+            port=int(port or 6379),
+            password=self._settings.redis_password,
+            db=self._settings.redis_db,
+            socket_timeout=self._settings.redis_socket_timeout,
+            socket_connect_timeout=self._settings.redis_socket_connect_timeout,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        try:
+            await client.ping()
+        except BaseException:  # Also close when cancelled after losing the race
+            await client.close()
+            raise
 
-            logger.info(
-                f"Redis connected successfully: "
-                f"host=redis-master, "
-                f"db={self._settings.redis_db}"
-            )
+        return client, None, f"direct host={host_port}"
 
-        except Exception as direct_error:
-            logger.warning(f"Direct connection failed, trying Sentinel: {direct_error}")
+    async def connect(self) -> None:
+        """
+        Connect to Redis.
 
-            try:
-                # Get sentinel hosts from settings
-                sentinel_nodes = self._settings.redis_sentinel_hosts_list
+        Sentinel discovery (all sentinels queried concurrently) is raced
+        against the optional direct host; the first to answer wins.
+        """
+        if self._redis is not None:
+            return
 
-                logger.info(f"Connecting to Redis Sentinel: nodes={sentinel_nodes}")
+        started = time.perf_counter()
+        attempts: list[asyncio.Task[tuple[redis.Redis, Sentinel | None, str]]] = [
+            asyncio.create_task(self._connect_sentinel())
+        ]
+        if self._settings.redis_direct_host:
+            attempts.append(
+                asyncio.create_task(self._connect_direct(self._settings.redis_direct_host))
+            )
 
-                # Create Sentinel instance (no password needed for Sentinel itself)
-                self._sentinel = Sentinel(
-                    sentinel_nodes,
-                    socket_timeout=self._settings.redis_socket_timeout,
-                    socket_connect_timeout=self._settings.redis_socket_connect_timeout,
-                )
+        logger.info(
+            f"Connecting to Redis: sentinels={self._settings.redis_sentinel_hosts_list}, "
+            f"direct={self._settings.redis_direct_host or 'disabled'}"
+        )
 
-                # Get master connection with automatic failover (password for Redis master)
-                self._redis = self._sentinel.master_for(
-                    self._settings.redis_sentinel_master,
-                    socket_timeout=self._settings.redis_socket_timeout,
-                    password=self._settings.redis_password,
-                    db=self._settings.redis_db,
-                    encoding="utf-8",
-                    decode_responses=True,
-                )
+        errors: list[BaseException] = []
+        pending = set(attempts)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        logger.warning(f"Redis connection attempt failed: {error}")
+                        errors.append(error)
+                        continue
+
+                    if self._redis is not None:
+                        # Lost the race by a hair; drop the extra client
+                        await task.result()[0].close()
+                        continue
+
+                    self._redis, self._sentinel, via = task.result()
+                    logger.info(
+                        f"Redis connected successfully via {via}, "
+                        f"db={self._settings.redis_db}, "
+                        f"startup={(time.perf_counter() - started) * 1000:.1f}ms"
+                    )
 
-                # Test connection
                 if self._redis is not None:
-                    await self._redis.ping()
-
-                # Get master info
-                master_address = await self._sentinel.discover_master(
-                    self._settings.redis_sentinel_master
-                )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
 
-                logger.info(
-                    f"Redis Sentinel connected successfully: "
-                    f"master={self._settings.redis_sentinel_master}, "
-                    f"address={master_address}, "
-                    f"db={self._settings.redis_db}"
-                )
-
-            except Exception as sentinel_error:
-                logger.exception(f"Failed to connect to Redis: {sentinel_error}")
-                # Re-raise to fail fast on startup
-                raise
+        if self._redis is None:
+            logger.error(f"Failed to connect to Redis: {errors}")
+            # Re-raise to fail fast on startup
+            raise errors[-1]
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
@@ -112,6 +647,10 @@ class RateLimiter:
                 self._redis = None
                 logger.info("Redis connection closed")
 
+            if self._replica is not None:
+                await self._replica.close()
+                self._replica = None
+
             if self._sentinel is not None:
                 # Sentinel connections are managed internally
                 self._sentinel = None
@@ -119,61 +658,129 @@ class RateLimiter:
         except Exception as e:
             logger.exception(f"Error during Redis disconnect: {e}")
 
-    async def is_allowed(self, identifier: str) -> bool:
+    async def _replica_for_reads(self) -> redis.Redis | None:
+        """
+        Return the replica client if it is within the staleness tolerance.
+
+        Replication lag is sampled from INFO replication at most once per
+        REDIS_REPLICA_MAX_LAG seconds, so the check itself stays cheap.
+        """
+        if self._replica is None:
+            return None
+
+        now = time.monotonic()
+        max_lag = self._settings.redis_replica_max_lag
+        if now - self._replica_checked_at >= max_lag:
+            self._replica_checked_at = now
+            try:
+                info = await self._replica.info("replication")
+                if info.get("role") == "master":
+                    # No replicas available: slave_for fell back to the master
+                    self._replica_fresh = True
+                else:
+                    self._replica_fresh = (
+                        info.get("master_link_status") == "up"
+                        and float(info.get("master_last_io_seconds_ago", "inf")) <= max_lag
+                    )
+            except redis.RedisError as e:
+                logger.warning(f"Redis replica lag check failed: {e}")
+                self._replica_fresh = False
+
+        return self._replica if self._replica_fresh else None
+
+    async def _read(self, command: Callable[[redis.Redis], Awaitable[T]]) -> T:
+        """
+        Run a read-only command, preferring a replica over the master.
+
+        All introspection reads (remaining, TTL, future stats/dashboard
+        queries) go through here; writes always use the master.
+        """
+        replica = await self._replica_for_reads()
+        if replica is not None:
+            try:
+                result = await command(replica)
+                self._replica_reads += 1
+                return result
+            except redis.RedisError as e:
+                logger.warning(f"Redis replica read failed, using master: {e}")
+                self._replica_fresh = False
+
+        assert self._redis is not None
+        self._replica_fallbacks += 1
+        return await command(self._redis)
+
+    async def is_allowed(self, identifier: str) -> RateLimitVerdict:
         """
         Check if the request is allowed based on rate limits.
 
-        Uses sliding window algorithm with Redis.
+        Uses sliding window counters for every configured window, evaluated
+        atomically by a Lua script.
 
         Args:
             identifier: Unique identifier (e.g., IP address)
 
         Returns:
-            True if allowed, False if rate limited
+            Verdict for the most restrictive window (limit, remaining requests
+            and seconds until a slot frees); truthy if allowed, falsy if limited
         """
         if self._redis is None:
             logger.warning("Redis not connected, allowing request (fail-open)")
-            return True
+            return self._fail_open()
+
+        cached = self._local.lookup(identifier)
+        if cached is not None:
+            logger.debug(f"Rate limit: local deny cache hit for {identifier}")
+            return cached
 
-        key = f"ratelimit:contact:{identifier}"
+        if not self.breaker.allow_request():
+            logger.debug("Redis circuit open, allowing request (fail-open)")
+            return self._fail_open()
 
         try:
-            # Get current count
-            current = await self._redis.get(key)
-
-            if current is None:
-                # First request, set counter with TTL
-                await self._redis.setex(
-                    key,
-                    self._settings.rate_limit_window_seconds,
-                    1,
-                )
-                logger.debug(f"Rate limit: first request for {identifier}")
-                return True
+            verdict = await self._evaluate(identifier)
+            self.breaker.record_success()
 
-            count = int(current)
+            if verdict.remaining == 0:
+                # Window exhausted: every request until reset is denied
+                self._local.deny(identifier, verdict)
 
-            if count >= self._settings.rate_limit_requests:
+            if not verdict.allowed:
                 logger.warning(
-                    f"Rate limit exceeded for {identifier}: "
-                    f"{count}/{self._settings.rate_limit_requests}"
+                    f"Rate limit exceeded for {identifier}: {verdict.limit}/{verdict.window}s"
                 )
-                return False
+                return verdict
 
-            # Increment counter
-            await self._redis.incr(key)
             logger.debug(
-                f"Rate limit: {count + 1}/{self._settings.rate_limit_requests} for {identifier}"
+                f"Rate limit: {verdict.limit - verdict.remaining}/{verdict.limit} for {identifier}"
             )
-            return True
+            return verdict
 
         except redis.RedisError as e:
+            self.breaker.record_failure()
             logger.exception(f"Redis error in rate limiter: {e}")
             # Fail-open: allow request on Redis errors to not block legitimate users
-            return True
+            return self._fail_open()
         except Exception as e:
+            self.breaker.record_failure()
             logger.exception(f"Unexpected error in rate limiter: {e}")
-            return True
+            return self._fail_open()
+
+    def stats(self) -> dict[str, Mapping[str, str | int | float]]:
+        """Rate limiter counters for health/metrics endpoints."""
+        stats: dict[str, Mapping[str, str | int | float]] = {
+            "local_cache": self._local.stats(),
+            "circuit_breaker": self.breaker.stats(),
+        }
+        if self._batcher is not None:
+            stats["batching"] = self._batcher.stats()
+        if self._settings.redis_replica_reads:
+            stats["replica_reads"] = {
+                "replica_reads": self._replica_reads,
+                "master_reads": self._replica_fallbacks,
+                "replica_fresh": self._replica_fresh,
+                "max_lag": self._settings.redis_replica_max_lag,
+            }
+        return stats
 
     async def get_remaining(self, identifier: str) -> int:
         """
@@ -183,24 +790,24 @@ class RateLimiter:
             identifier: Unique identifier
 
         Returns:
-            Number of remaining requests in the current window
+            Number of remaining requests in the most restrictive window
         """
-        if self._redis is None:
-            return self._settings.rate_limit_requests
-
-        key = f"ratelimit:contact:{identifier}"
+        windows = self._settings.rate_limit_windows_list
+        if self._redis is None or not self.breaker.allow_request():
+            return min(limit for limit, _ in windows)
 
         try:
-            current = await self._redis.get(key)
-            if current is None:
-                return int(self._settings.rate_limit_requests)
-
-            remaining = max(0, self._settings.rate_limit_requests - int(current))
-            return int(remaining)
+            fields = await self._read(lambda client: client.hgetall(self._key(identifier)))
+            self.breaker.record_success()
+            now_ms = int(time.time() * 1000)
+            return min(
+                _window_remaining(fields, limit, window * 1000, now_ms) for limit, window in windows
+            )
 
         except Exception as e:
+            self.breaker.record_failure()
             logger.exception(f"Error getting remaining requests: {e}")
-            return int(self._settings.rate_limit_requests)
+            return min(limit for limit, _ in windows)
 
     async def get_ttl(self, identifier: str) -> int:
         """
@@ -212,15 +819,15 @@ class RateLimiter:
         Returns:
             Seconds until rate limit resets, or 0 if no limit active
         """
-        if self._redis is None:
+        if self._redis is None or not self.breaker.allow_request():
             return 0
 
-        key = f"ratelimit:contact:{identifier}"
-
         try:
-            ttl = await self._redis.ttl(key)
+            ttl = await self._read(lambda client: client.ttl(self._key(identifier)))
+            self.breaker.record_success()
             return int(max(0, ttl)) if ttl > 0 else 0
         except Exception as e:
+            self.breaker.record_failure()
             logger.exception(f"Error getting TTL: {e}")
             return 0
 
@@ -0,0 +1,222 @@
+"""
+Multi-process worker supervisor.
+
+Runs N worker processes in the same consumer groups, so Kafka spreads the
+partitions over them and a worker host uses all of its cores. Children that
+exit unexpectedly are restarted with exponential backoff; SIGTERM/SIGINT are
+forwarded so every child drains and commits before it exits. Each child
+stamps a shared heartbeat from its event loop, and the supervisor folds the
+children into one status, written as JSON for health checks.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Child entry point: (index, heartbeat) where heartbeat holds the last beat (epoch seconds)
+WorkerTarget = Callable[[int, Synchronized], None]
+
+
+@dataclass
+class _Child:
+    index: int
+    heartbeat: Synchronized
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restart_at: float = 0.0
+    restarts: int = 0
+    failures: int = 0  # Consecutive crashes, reset once a child stays up
+
+
+class WorkerSupervisor:
+    """Starts, restarts and stops worker processes."""
+
+    def __init__(
+        self,
+        processes: int,
+        target: WorkerTarget,
+        restart_backoff: float = 1.0,
+        restart_backoff_max: float = 60.0,
+        stable_after: float = 60.0,
+        heartbeat_timeout: float = 30.0,
+        shutdown_timeout: float = 30.0,
+        status_path: str | None = None,
+        poll_interval: float = 1.0,
+    ):
+        self._target = target
+        self._restart_backoff = restart_backoff
+        self._restart_backoff_max = restart_backoff_max
+        self._stable_after = stable_after
+        self._heartbeat_timeout = heartbeat_timeout
+        self._shutdown_timeout = shutdown_timeout
+        self._status_path = status_path
+        self._poll_interval = poll_interval
+        self._stopping = False
+
+        self._context = multiprocessing.get_context("fork")
+        self._children = [
+            _Child(index=i, heartbeat=self._context.Value("d", 0.0, lock=False))
+            for i in range(1, processes + 1)
+        ]
+
+    def run(self) -> int:
+        """Supervise until SIGTERM/SIGINT, then stop the children. Blocks."""
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._request_stop)
+
+        logger.info(f"Starting {len(self._children)} worker processes")
+        self.start()
+        try:
+            while not self._stopping:
+                self.check()
+                self._write_status()
+                time.sleep(self._poll_interval)
+        finally:
+            self.stop()
+            self._write_status()
+        return 0
+
+    def _request_stop(self, signum: int, frame) -> None:
+        logger.info(f"Received signal {signal.Signals(signum).name}, stopping workers...")
+        self._stopping = True
+
+    def start(self) -> None:
+        """Start every child process."""
+        for child in self._children:
+            self._spawn(child)
+
+    def _spawn(self, child: _Child) -> None:
+        child.heartbeat.value = 0.0
+        child.process = self._context.Process(
+            target=self._target,
+            args=(child.index, child.heartbeat),
+            name=f"worker-{child.index}",
+        )
+        child.process.start()
+        child.started_at = time.monotonic()
+        logger.info(f"Worker {child.index} started (pid {child.process.pid})")
+
+    def check(self) -> None:
+        """Reap exited children and restart them once their backoff has passed."""
+        now = time.monotonic()
+        for child in self._children:
+            if child.process is None:
+                if now >= child.restart_at:
+                    child.restarts += 1
+                    self._spawn(child)
+                continue
+
+            if child.process.is_alive():
+                continue
+
+            exitcode = child.process.exitcode
+            child.process.join()
+            child.process = None
+
+            # A child that stayed up for a while starts a fresh backoff sequence
+            uptime = now - child.started_at
+            child.failures = 1 if uptime >= self._stable_after else child.failures + 1
+            delay = min(
+                self._restart_backoff * 2 ** (child.failures - 1), self._restart_backoff_max
+            )
+            child.restart_at = now + delay
+            logger.warning(
+                f"Worker {child.index} exited with code {exitcode} after {uptime:.1f}s, "
+                f"restarting in {delay:.1f}s"
+            )
+
+    def stop(self) -> None:
+        """Forward SIGTERM to the children, wait for them to drain, kill stragglers."""
+        self._stopping = True
+        running = [c.process for c in self._children if c.process and c.process.is_alive()]
+        for process in running:
+            process.terminate()  # SIGTERM: the worker drains and commits
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error(f"{process.name} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+        for child in self._children:
+            child.process = None
+        logger.info("All workers stopped")
+
+    def status(self) -> dict[str, object]:
+        """One status for all children: healthy, degraded, unhealthy or stopping."""
+        now = time.time()
+        children = []
+        for child in self._children:
+            process = child.process
+            alive = process is not None and process.is_alive()
+            beat = child.heartbeat.value
+            heartbeat_age = round(now - beat, 1) if beat else None
+            children.append(
+                {
+                    "index": child.index,
+                    "pid": process.pid if process is not None and alive else None,
+                    "alive": alive,
+                    "healthy": alive
+                    and heartbeat_age is not None
+                    and heartbeat_age <= self._heartbeat_timeout,
+                    "heartbeat_age": heartbeat_age,
+                    "restarts": child.restarts,
+                }
+            )
+
+        healthy = sum(1 for child in children if child["healthy"])
+        if self._stopping:
+            state = "stopping"
+        elif healthy == len(children):
+            state = "healthy"
+        elif healthy:
+            state = "degraded"
+        else:
+            state = "unhealthy"
+
+        return {
+            "status": state,
+            "processes": len(children),
+            "healthy": healthy,
+            "updated_at": now,
+            "children": children,
+        }
+
+    def _write_status(self) -> None:
+        if not self._status_path:
+            return
+        try:
+            directory = os.path.dirname(self._status_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self._status_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f)
+            os.replace(tmp_path, self._status_path)  # Readers never see a partial file
+        except OSError as e:
+            logger.warning(f"Failed to write worker status to {self._status_path}: {e}")
+
+
+def read_status(path: str, max_age: float) -> dict[str, object]:
+    """Supervisor status from `path`; unhealthy if missing or not updated for `max_age`."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            status: dict[str, Any] = json.load(f)
+    except (OSError, ValueError) as e:
+        return {"status": "unhealthy", "error": f"no status: {e}"}
+
+    if time.time() - status.get("updated_at", 0) > max_age:
+        return {**status, "status": "unhealthy", "error": "supervisor not responding"}
+    return status
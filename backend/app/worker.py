@@ -1,36 +1,64 @@
 """
 Kafka worker entry point.
 Run with: python -m app.worker
+Several processes under a supervisor: python -m app.worker --processes [N]
+Supervisor status (for health checks): python -m app.worker --status
 """
 
+import argparse
 import asyncio
+import json
 import logging
+import os
 import signal
+import sys
+import time
+from multiprocessing.sharedctypes import Synchronized
 
+from app.config import get_settings
 from app.kafka.consumer import KafkaConsumerService
+from app.kafka.notifier import NotificationConsumerService
+from app.supervisor import WorkerSupervisor, read_status
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
-# Global consumer reference for signal handling
+# Global consumer references for signal handling
 consumer: KafkaConsumerService | None = None
+notifier: NotificationConsumerService | None = None
+shutting_down = False
+
+HEARTBEAT_INTERVAL = 5.0  # Seconds between heartbeats reported to the supervisor
 
 
 async def shutdown(sig: signal.Signals) -> None:
     """Handle shutdown signals gracefully."""
+    global shutting_down
+    if shutting_down:
+        return  # Ctrl+C reaches both the supervisor and its children
+    shutting_down = True
     logger.info(f"Received signal {sig.name}, shutting down...")
 
     if consumer:
         await consumer.stop()
+    if notifier:
+        await notifier.stop()
+
+
+async def beat(heartbeat: Synchronized) -> None:
+    """Tell the supervisor that the event loop is responsive."""
+    while True:
+        heartbeat.value = time.time()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
 
 
-async def main() -> None:
-    """Main entry point for the worker."""
-    global consumer
+async def main(heartbeat: Synchronized | None = None) -> int:
+    """Main entry point for the worker. Returns the process exit code."""
+    global consumer, notifier
 
     logger.info("Starting Kafka worker...")
 
@@ -42,18 +70,75 @@ async def main() -> None:
             lambda s=sig: asyncio.create_task(shutdown(s)),
         )
 
-    # Create and start consumer
+    heartbeat_task = asyncio.create_task(beat(heartbeat)) if heartbeat is not None else None
+
+    # Contact processing (save + commit) and Telegram notification run as separate stages
     consumer = KafkaConsumerService()
+    notifier = NotificationConsumerService()
+    exit_code = 0
 
     try:
         await consumer.start()
-        await consumer.run()
+        await notifier.start()
+        await asyncio.gather(consumer.run(), notifier.run())
     except Exception as e:
         logger.exception(f"Worker error: {e}")
+        exit_code = 1  # Lets the supervisor restart the process
     finally:
+        if heartbeat_task:
+            heartbeat_task.cancel()
         await consumer.stop()
+        await notifier.stop()
         logger.info("Worker stopped")
 
+    return exit_code
+
+
+def run_child(index: int, heartbeat: Synchronized) -> None:
+    """Worker process started by the supervisor."""
+    # Drop the supervisor's handlers until main() installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    sys.exit(asyncio.run(main(heartbeat)))
+
+
+def cli(argv: list[str] | None = None) -> int:
+    """Parse arguments and run a single worker, the supervisor or a status check."""
+    parser = argparse.ArgumentParser(description="Kafka worker")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="?",
+        const=0,
+        help="Run N worker processes under a supervisor (default: CPU count)",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Print the supervisor status; exit code 1 unless healthy or degraded",
+    )
+    args = parser.parse_args(argv)
+    settings = get_settings()
+
+    if args.status:
+        status = read_status(settings.worker_status_path, settings.worker_status_max_age_seconds)
+        print(json.dumps(status, indent=2))
+        return 0 if status["status"] in ("healthy", "degraded") else 1
+
+    if args.processes is None:
+        return asyncio.run(main())
+
+    supervisor = WorkerSupervisor(
+        processes=args.processes or os.cpu_count() or 1,
+        target=run_child,
+        restart_backoff=settings.worker_restart_backoff_seconds,
+        restart_backoff_max=settings.worker_restart_backoff_max_seconds,
+        heartbeat_timeout=settings.worker_heartbeat_timeout_seconds,
+        shutdown_timeout=settings.worker_shutdown_timeout_seconds,
+        status_path=settings.worker_status_path,
+    )
+    return supervisor.run()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(cli())
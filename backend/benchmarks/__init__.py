@@ -0,0 +1,3 @@
+"""
+Local performance benchmarks (not part of the test suite).
+"""
@@ -0,0 +1,81 @@
+"""
+ContactMessage codec microbenchmark.
+
+Compares the previous two-step serialization (model_dump + json.dumps on the
+producer, json.loads + ContactMessage(**data) on the consumer) with the
+single-pass codec in app.kafka.codec, in both wire formats, and reports CPU
+time and encoded size per message.
+
+Run from the backend directory:
+    python -m benchmarks.contact_codec
+    python -m benchmarks.contact_codec --messages 5000 --repeat 7
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from app.kafka.codec import MSGPACK_FORMAT, decode_contact, encode_contact, wire_headers
+from app.models import ContactMessage
+from benchmarks.kafka_producer_profiles import make_payloads
+
+
+def legacy_encode(message: ContactMessage) -> bytes:
+    return json.dumps(message.model_dump(mode="json")).encode("utf-8")
+
+
+def legacy_decode(data: bytes) -> ContactMessage:
+    return ContactMessage(**json.loads(data.decode("utf-8")))
+
+
+def per_message_us(func: Callable, items: list, repeat: int) -> float:
+    """Best-of-`repeat` CPU time per item in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for item in items:
+            func(item)
+        best = min(best, time.process_time() - start)
+    return best / len(items) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [decode_contact(value) for _, value in make_payloads(args.messages)]
+    encoded = [encode_contact(message) for message in messages]
+    packed = [encode_contact(message, MSGPACK_FORMAT) for message in messages]
+    headers = wire_headers(MSGPACK_FORMAT)
+
+    rows = [
+        (
+            "encode",
+            per_message_us(legacy_encode, messages, args.repeat),
+            per_message_us(encode_contact, messages, args.repeat),
+            per_message_us(lambda m: encode_contact(m, MSGPACK_FORMAT), messages, args.repeat),
+        ),
+        (
+            "decode",
+            per_message_us(legacy_decode, encoded, args.repeat),
+            per_message_us(decode_contact, encoded, args.repeat),
+            per_message_us(lambda d: decode_contact(d, headers), packed, args.repeat),
+        ),
+    ]
+
+    print(f"{args.messages} messages, best of {args.repeat} (CPU µs/message)")
+    print(f"  {'':<8}{'legacy':>10}{'json':>10}{'msgpack':>10}")
+    for name, legacy, json_codec, msgpack_codec in rows:
+        print(f"  {name:<8}{legacy:>10.2f}{json_codec:>10.2f}{msgpack_codec:>10.2f}")
+
+    legacy_size = sum(len(legacy_encode(m)) for m in messages) / len(messages)
+    json_size = sum(map(len, encoded)) / len(encoded)
+    packed_size = sum(map(len, packed)) / len(packed)
+    print(f"  {'bytes':<8}{legacy_size:>10.0f}{json_size:>10.0f}{packed_size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Contact insert benchmark.
+
+Compares rows/sec for the ways the worker can store a consumer batch in
+PostgreSQL:
+
+    orm        DatabaseService.save_contact, one session and commit per row
+    multirow   DatabaseService.save_contacts, one INSERT ... ON CONFLICT per batch
+    copy       asyncpg COPY into a temporary staging table, then
+               INSERT ... SELECT ... ON CONFLICT (id) DO NOTHING
+
+The contacts table is truncated before every run, so point --dsn at a
+throwaway database.
+
+Run from the backend directory:
+    python -m benchmarks.contact_inserts --dsn postgresql+asyncpg://postgres@localhost/bench
+    python -m benchmarks.contact_inserts --dsn ... --rows 20000 --methods multirow copy
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+import asyncpg
+
+from app.config import get_settings
+from app.database.service import DatabaseService, contact_row
+from app.models import ContactMessage
+from benchmarks.kafka_producer_profiles import make_payloads
+
+COLUMNS = (
+    "id",
+    "name",
+    "message",
+    "channels",
+    "contacts",
+    "ip_address",
+    "user_agent",
+    "created_at",
+    "processed_at",
+)
+
+
+def make_messages(count: int) -> list[ContactMessage]:
+    """Realistic contact messages, the same ones the producer benchmark sends."""
+    return [ContactMessage.model_validate_json(value) for _, value in make_payloads(count)]
+
+
+def batches(messages: list[ContactMessage], size: int) -> list[list[ContactMessage]]:
+    return [messages[i : i + size] for i in range(0, len(messages), size)]
+
+
+async def insert_orm(service: DatabaseService, messages: list[ContactMessage], _: int) -> None:
+    for message in messages:
+        await service.save_contact(message)
+
+
+async def insert_multirow(
+    service: DatabaseService, messages: list[ContactMessage], batch_size: int
+) -> None:
+    for batch in batches(messages, batch_size):
+        await service.save_contacts(batch)
+
+
+async def insert_copy(
+    conn: asyncpg.Connection, messages: list[ContactMessage], batch_size: int
+) -> None:
+    columns = ", ".join(COLUMNS)
+    for batch in batches(messages, batch_size):
+        processed_at = datetime.utcnow()
+        records = []
+        for message in batch:
+            row = contact_row(message)
+            row["channels"] = json.dumps(row["channels"])
+            row["contacts"] = json.dumps(row["contacts"])
+            row["processed_at"] = processed_at
+            records.append(tuple(row[column] for column in COLUMNS))
+
+        async with conn.transaction():
+            await conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS contacts_staging "
+                "(LIKE contacts INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            await conn.copy_records_to_table("contacts_staging", records=records, columns=COLUMNS)
+            await conn.execute(
+                f"INSERT INTO contacts ({columns}) SELECT {columns} FROM contacts_staging "
+                "ON CONFLICT (id) DO NOTHING"
+            )
+
+
+async def bench_method(
+    method: str,
+    service: DatabaseService,
+    conn: asyncpg.Connection,
+    messages: list[ContactMessage],
+    batch_size: int,
+) -> dict[str, Any]:
+    """Insert every message with one method into an empty table."""
+    await conn.execute("TRUNCATE contacts")
+
+    start = time.perf_counter()
+    if method == "orm":
+        await insert_orm(service, messages, batch_size)
+    elif method == "multirow":
+        await insert_multirow(service, messages, batch_size)
+    else:
+        await insert_copy(conn, messages, batch_size)
+    elapsed = time.perf_counter() - start
+
+    stored = await conn.fetchval("SELECT count(*) FROM contacts")
+    return {
+        "method": method,
+        "rows": len(messages),
+        "stored": stored,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(messages) / elapsed, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", required=True, help="asyncpg URL of a scratch database")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per consumer batch")
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=["orm", "multirow", "copy"],
+        default=["orm", "multirow", "copy"],
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    service = DatabaseService()
+    service._settings = get_settings().model_copy(update={"postgres_url": args.dsn, "debug": False})
+    await service.connect()  # Creates the contacts table if needed
+    conn = await asyncpg.connect(args.dsn.replace("postgresql+asyncpg://", "postgresql://"))
+
+    messages = make_messages(args.rows)
+    print(f"{args.rows} rows, batches of {args.batch_size}")
+
+    results = []
+    try:
+        for method in args.methods:
+            result = await bench_method(method, service, conn, messages, args.batch_size)
+            results.append(result)
+            print(
+                f"  {method:<9} {result['rows_per_sec']:>10.0f} rows/s  "
+                f"{result['seconds']:>8.3f}s  ({result['stored']} stored)"
+            )
+    finally:
+        await conn.execute("TRUNCATE contacts")
+        await conn.close()
+        await service.disconnect()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"parameters": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
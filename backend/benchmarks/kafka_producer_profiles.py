@@ -0,0 +1,176 @@
+"""
+Kafka producer profile benchmark.
+
+Pushes realistic ContactMessage payloads through KafkaProducerService for
+every producer profile in app.config.KAFKA_PRODUCER_PROFILES and reports
+messages/sec and send latency (p50/p99). Each profile runs a fresh service
+against a real broker, so batching, compression and request timeouts are
+aiokafka's own.
+
+The topic is created if missing; point --bootstrap-servers at a throwaway
+cluster.
+
+Run from the backend directory:
+    python -m benchmarks.kafka_producer_profiles --bootstrap-servers localhost:9092
+    python -m benchmarks.kafka_producer_profiles --bootstrap-servers ... --messages 20000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Any
+
+from aiokafka.admin import AIOKafkaAdminClient, NewTopic
+
+from app.config import KAFKA_PRODUCER_PROFILES, get_settings
+from app.kafka.codec import encode_contact
+from app.models import ContactChannel, ContactInfo, ContactMessage
+from app.services.kafka_producer import KafkaProducerService
+
+WORDS = (
+    "hello project website backend frontend design deadline budget meeting "
+    "integration kafka redis telegram contract proposal review support thanks"
+).split()
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1",
+)
+
+
+def make_messages(count: int, seed: int = 42) -> list[ContactMessage]:
+    """Build realistic contact messages of varying length."""
+    rng = random.Random(seed)
+    return [
+        ContactMessage(
+            name=f"Visitor {i}",
+            message=" ".join(rng.choices(WORDS, k=rng.randint(10, 200))),
+            channels=[ContactChannel.TELEGRAM, ContactChannel.EMAIL],
+            contacts=ContactInfo(telegram=f"@visitor{i}", email=f"visitor{i}@example.com"),
+            ip_address=f"203.0.113.{i % 256}",
+            user_agent=rng.choice(USER_AGENTS),
+        )
+        for i in range(count)
+    ]
+
+
+def make_payloads(count: int, seed: int = 42) -> list[tuple[bytes, bytes]]:
+    """Build (key, value) pairs serialized exactly like KafkaProducerService."""
+    return [
+        (str(message.id).encode("utf-8"), encode_contact(message))
+        for message in make_messages(count, seed)
+    ]
+
+
+async def ensure_topic(bootstrap_servers: str, topic: str, partitions: int) -> None:
+    """Create the benchmark topic unless it already exists."""
+    admin = AIOKafkaAdminClient(bootstrap_servers=bootstrap_servers)
+    await admin.start()
+    try:
+        if topic not in await admin.list_topics():
+            await admin.create_topics(
+                [NewTopic(topic, num_partitions=partitions, replication_factor=1)]
+            )
+    finally:
+        await admin.close()
+
+
+async def bench_profile(
+    name: str, messages: list[ContactMessage], args: argparse.Namespace
+) -> dict[str, Any]:
+    """Send every message through one profile with `args.concurrency` callers."""
+    service = KafkaProducerService()
+    service._settings = get_settings().model_copy(
+        update={
+            "kafka_bootstrap_servers": args.bootstrap_servers,
+            "kafka_topic": args.topic,
+            "kafka_dlq_topic": args.topic,
+            "kafka_topic_partitions": 0,
+            "kafka_dlq_topic_partitions": 0,
+            "kafka_producer_profile": name,
+            # Measure the profile as defined, not the environment's overrides
+            "kafka_linger_ms": None,
+            "kafka_max_batch_size": None,
+            "kafka_compression_type": None,
+            "kafka_request_timeout_ms": None,
+        }
+    )
+    await service.start()
+    await service.warm_up()  # Keep the metadata fetch out of the measurement
+
+    latencies: list[float] = []
+    failed = 0
+    queue = iter(messages)
+
+    async def caller() -> None:
+        nonlocal failed
+        for message in queue:
+            start = time.perf_counter()
+            if not await service.send_contact_message(message):
+                failed += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(caller() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await service.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "profile": name,
+        "options": service._settings.kafka_producer_options,
+        "messages_per_sec": round(len(messages) / elapsed, 1),
+        "failed": failed,
+        "p50_ms": round(quantiles[49], 3),
+        "p99_ms": round(quantiles[98], 3),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bootstrap-servers", required=True, help="Broker of a scratch cluster")
+    parser.add_argument("--topic", default="contact-producer-bench")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--partitions", type=int, default=3)
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=list(KAFKA_PRODUCER_PROFILES),
+        default=list(KAFKA_PRODUCER_PROFILES),
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    await ensure_topic(args.bootstrap_servers, args.topic, args.partitions)
+    messages = make_messages(args.messages)
+    print(
+        f"{args.messages} messages, {args.concurrency} callers, "
+        f"topic {args.topic} ({args.partitions} partitions)"
+    )
+
+    results = []
+    for name in args.profiles:
+        result = await bench_profile(name, messages, args)
+        results.append(result)
+        print(
+            f"  {name:<11} {result['messages_per_sec']:>9.0f} msg/s  "
+            f"p50={result['p50_ms']:.3f}ms  p99={result['p99_ms']:.3f}ms  "
+            f"({result['failed']} failed)"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"parameters": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
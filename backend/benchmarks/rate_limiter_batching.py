@@ -0,0 +1,88 @@
+"""
+Benchmark: per-call script invocation vs. pipelined micro-batches.
+
+Run from the backend directory:
+    python -m benchmarks.rate_limiter_batching
+    python -m benchmarks.rate_limiter_batching --redis-url redis://localhost:6379/0
+
+Prints ops/sec and p50/p99 latency per concurrency level for both modes and
+the lowest concurrency at which batching wins (the crossover point).
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import redis.asyncio as redis
+from fakeredis import aioredis as fakeredis
+
+from app.services.rate_limiter import RateLimitBatcher, RateLimiter
+
+
+async def run(
+    limiter: RateLimiter, iterations: int, concurrency: int
+) -> tuple[float, float, float]:
+    """Return (ops/sec, p50 ms, p99 ms) for `iterations` checks at `concurrency`."""
+    latencies: list[float] = []
+    counter = iter(range(iterations))
+
+    async def caller() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            await limiter.is_allowed(f"ip-{i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return iterations / elapsed, quantiles[49], quantiles[98]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", help="Real Redis URL (default: fakeredis[lua])")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--max-size", type=int, default=64)
+    parser.add_argument("--max-delay-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    if args.redis_url:
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        client = fakeredis.FakeRedis(decode_responses=True)
+
+    crossover = None
+    for concurrency in (1, 10, 100, 1000):
+        row = []
+        for batched in (False, True):
+            await client.flushdb()
+            limiter = RateLimiter()
+            limiter._redis = client
+            if batched:
+                limiter._batcher = RateLimitBatcher(
+                    limiter._execute_batch,
+                    max_size=args.max_size,
+                    max_delay=args.max_delay_ms / 1000,
+                )
+            ops, p50, p99 = await run(limiter, args.iterations, concurrency)
+            row.append(ops)
+            print(
+                f"{'batched' if batched else 'direct':<8} concurrency={concurrency:<5} "
+                f"{ops:>10.0f} ops/sec  p50={p50:7.2f}ms  p99={p99:7.2f}ms"
+            )
+        if crossover is None and row[1] > row[0]:
+            crossover = concurrency
+
+    print(f"crossover: {crossover if crossover else 'not reached'} concurrent callers")
+    await client.flushdb()
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
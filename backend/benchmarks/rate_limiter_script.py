@@ -0,0 +1,98 @@
+"""
+Benchmark: atomic sliding window script vs. the legacy GET/SETEX/INCR path.
+
+Run from the backend directory:
+    python -m benchmarks.rate_limiter_script
+    python -m benchmarks.rate_limiter_script --redis-url redis://localhost:6379/0
+
+fakeredis has no network hop and interprets Lua in-process, so it mostly
+measures client CPU; the saved round trip only shows up against a real server.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import redis.asyncio as redis
+from fakeredis import aioredis as fakeredis
+
+from app.services.rate_limiter import RateLimiter
+
+
+async def legacy_is_allowed(client: redis.Redis, identifier: str, limit: int, window: int) -> bool:
+    """The pre-script implementation: GET, then SETEX or INCR (two round trips)."""
+    key = f"ratelimit:legacy:{identifier}"
+    current = await client.get(key)
+    if current is None:
+        await client.setex(key, window, 1)
+        return True
+    if int(current) >= limit:
+        return False
+    await client.incr(key)
+    return True
+
+
+async def bench(name: str, call, iterations: int, concurrency: int) -> None:
+    """Run `call(i)` `iterations` times with the given concurrency and print ops/sec."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> bool:
+        async with semaphore:
+            return bool(await call(i))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(iterations)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<10} concurrency={concurrency:<4} "
+        f"{iterations / elapsed:>10.0f} ops/sec  allowed={sum(results)}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", help="Real Redis URL (default: fakeredis[lua])")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--identifiers", type=int, default=100)
+    args = parser.parse_args()
+
+    # Denials log a warning per request; keep the output readable
+    logging.disable(logging.WARNING)
+
+    if args.redis_url:
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        client = fakeredis.FakeRedis(decode_responses=True)
+
+    limiter = RateLimiter()
+    limiter._redis = client
+    limit = limiter._settings.rate_limit_requests
+    window = limiter._settings.rate_limit_window_seconds
+
+    for concurrency in (1, 10, 100):
+        await client.flushdb()
+        await bench(
+            "legacy",
+            lambda i: legacy_is_allowed(client, f"ip-{i % args.identifiers}", limit, window),
+            args.iterations,
+            concurrency,
+        )
+        await client.flushdb()
+        limiter._local.clear()  # Start each round with an empty deny cache
+        await bench(
+            "script",
+            lambda i: limiter.is_allowed(f"ip-{i % args.identifiers}"),
+            args.iterations,
+            concurrency,
+        )
+
+    # With correct atomic limiting, allowed == identifiers * limit for both
+    # paths; any excess on the legacy path is the GET/INCR race.
+    await client.flushdb()
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
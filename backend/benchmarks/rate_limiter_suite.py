@@ -0,0 +1,191 @@
+"""
+Rate limiter benchmark suite.
+
+Measures ops/sec and p50/p99 latency of RateLimiter.is_allowed and
+RateLimiter.get_remaining at 1, 10, 100 and 1000 concurrent callers against
+fakeredis[lua] and, when the binary is available, a throwaway local
+redis-server. Results are written as JSON to track regressions between
+releases.
+
+Run from the backend directory:
+    python -m benchmarks.rate_limiter_suite --output bench-rate-limiter.json
+    python -m benchmarks.rate_limiter_suite --backends redis-server --iterations 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+import redis.asyncio as redis
+from fakeredis import aioredis as fakeredis
+
+from app.services.rate_limiter import RateLimiter
+
+CONCURRENCY_LEVELS = (1, 10, 100, 1000)
+OPERATIONS = ("is_allowed", "get_remaining")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def fakeredis_backend() -> AsyncIterator[redis.Redis]:
+    """In-process fakeredis with Lua support."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def redis_server_backend(binary: str) -> AsyncIterator[redis.Redis]:
+    """Throwaway redis-server on a free port, without persistence."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [binary, "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    client = redis.Redis(port=port, decode_responses=True)
+    try:
+        for _ in range(50):
+            try:
+                await client.ping()
+                break
+            except redis.ConnectionError:
+                await asyncio.sleep(0.1)
+        else:
+            raise RuntimeError(f"redis-server did not start on port {port}")
+        yield client
+    finally:
+        await client.aclose()
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def measure(
+    call: Callable[[int], Awaitable[Any]], iterations: int, concurrency: int
+) -> dict[str, float]:
+    """Run `call(i)` for i in range(iterations) from `concurrency` workers."""
+    latencies: list[float] = []
+    counter = iter(range(iterations))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, iterations))))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "p50_ms": round(quantiles[49], 3),
+        "p99_ms": round(quantiles[98], 3),
+    }
+
+
+async def bench_backend(client: redis.Redis, iterations: int, identifiers: int) -> list[dict]:
+    """Benchmark every operation and concurrency level against one client."""
+    results = []
+    for operation in OPERATIONS:
+        for concurrency in CONCURRENCY_LEVELS:
+            await client.flushdb()
+            limiter = RateLimiter()
+            limiter._redis = client
+
+            if operation == "get_remaining":
+                # Read against populated keys
+                for i in range(min(identifiers, iterations)):
+                    await limiter.is_allowed(f"bench-{i}")
+
+            method = getattr(limiter, operation)
+            stats = await measure(
+                lambda i, method=method: method(f"bench-{i % identifiers}"),
+                iterations,
+                concurrency,
+            )
+            results.append({"operation": operation, "concurrency": concurrency, **stats})
+            print(
+                f"  {operation:<14} concurrency={concurrency:<5} "
+                f"{stats['ops_per_sec']:>10.0f} ops/sec  "
+                f"p50={stats['p50_ms']:8.3f}ms  p99={stats['p99_ms']:8.3f}ms"
+            )
+    await client.flushdb()
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=("fakeredis", "redis-server"),
+        default=["fakeredis", "redis-server"],
+    )
+    parser.add_argument("--redis-server-bin", default=shutil.which("redis-server"))
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument(
+        "--identifiers",
+        type=int,
+        default=100000,
+        help="Distinct identifiers to rotate through (large = mostly allowed path)",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    report: dict[str, Any] = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "identifiers": args.identifiers,
+        "backends": {},
+    }
+
+    for backend in args.backends:
+        print(f"{backend}:")
+        if backend == "fakeredis":
+            context = fakeredis_backend()
+        elif args.redis_server_bin:
+            context = redis_server_backend(args.redis_server_bin)
+        else:
+            print("  skipped: redis-server binary not found")
+            report["backends"][backend] = {"skipped": "redis-server binary not found"}
+            continue
+
+        async with context as client:
+            report["backends"][backend] = {
+                "results": await bench_backend(client, args.iterations, args.identifiers)
+            }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
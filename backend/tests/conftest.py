@@ -2,7 +2,8 @@
 Pytest fixtures for tests.
 """
 import os
-from typing import AsyncGenerator, Generator
+from collections.abc import Callable
+from typing import Any, AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -12,6 +13,7 @@ from redis.asyncio import Redis
 
 from app.config import Settings, get_settings
 from app.main import create_app
+from app.models import ContactChannel, ContactInfo, ContactMessage
 from app.services.kafka_producer import KafkaProducerService
 from app.services.rate_limiter import RateLimiter
 
@@ -104,3 +106,57 @@ def sample_contact_data() -> dict:
 def valid_api_key(test_settings: Settings) -> str:
     """Get valid API key for tests."""
     return test_settings.public_api_key
+
+
+@pytest.fixture
+def make_contact_message() -> Callable[..., ContactMessage]:
+    """Factory for contact messages; keyword arguments override the defaults."""
+
+    def make(**fields) -> ContactMessage:
+        defaults = {
+            "name": "John Doe",
+            "message": "Test message",
+            "channels": [ContactChannel.TELEGRAM],
+            "contacts": ContactInfo(telegram="@johndoe"),
+        }
+        return ContactMessage(**{**defaults, **fields})
+
+    return make
+
+
+@pytest.fixture
+def sample_contact_message(make_contact_message: Callable[..., ContactMessage]) -> ContactMessage:
+    """Create a sample contact message."""
+    return make_contact_message()
+
+
+@pytest.fixture
+def make_kafka_service() -> Callable[..., Any]:
+    """
+    Factory for a Kafka consuming service built with `settings`.
+
+    Its consumer returns `batches` from getmany one by one and then stops
+    the run loop; its producer is a mock.
+    """
+
+    def make(
+        service_class: type, module: str, batches: list[dict], assignment: set, settings: Settings
+    ) -> Any:
+        with patch(f"{module}.get_settings", return_value=settings):
+            service = service_class()
+
+        async def getmany(**kwargs):
+            if not batches:
+                service._running = False
+                return {}
+            return batches.pop(0)
+
+        consumer = MagicMock()
+        consumer.getmany = AsyncMock(side_effect=getmany)
+        consumer.commit = AsyncMock()
+        consumer.assignment.return_value = assignment
+        service._consumer = consumer
+        service._producer = MagicMock(send_and_wait=AsyncMock())
+        return service
+
+    return make
@@ -0,0 +1,62 @@
+"""Tests for adaptive admission control."""
+from app.services.admission import AdaptiveConcurrencyLimiter
+
+
+def test_admission_sheds_over_limit():
+    """Test that requests beyond the concurrency limit are rejected."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=2, min_limit=1)
+
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is False
+
+    limiter.release({"kafka": 0.01})
+    assert limiter.try_acquire() is True
+    assert limiter.stats()["shed"] == 1
+
+
+def test_admission_decreases_on_slow_downstream():
+    """Test that a slow sample cuts the limit once per target-latency interval."""
+    limiter = AdaptiveConcurrencyLimiter(
+        "test", initial_limit=100, min_limit=10, target_latency=0.2, backoff_ratio=0.5
+    )
+
+    for _ in range(3):
+        limiter.try_acquire()
+    for _ in range(3):
+        limiter.release({"rate_limit": 0.05, "kafka": 0.3})
+
+    assert limiter.limit == 50
+    assert limiter.stats()["decreases"] == 1
+    assert limiter.stats()["latency_ms"]["kafka"] == 300.0
+
+
+def test_admission_grows_while_saturated_and_fast():
+    """Test that fast samples raise the limit only while it is in use."""
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10, min_limit=1, max_limit=11)
+
+    limiter.try_acquire()
+    limiter.release({"kafka": 0.01})
+    assert limiter.limit == 10  # Mostly idle: no growth
+
+    # Keep the limit saturated for two windows of requests
+    for _ in range(10):
+        limiter.try_acquire()
+    for _ in range(20):
+        limiter.release({"kafka": 0.01})
+        limiter.try_acquire()
+
+    assert limiter.limit == 11
+
+
+def test_admission_respects_min_limit():
+    """Test that repeated overload never drops the limit below the minimum."""
+    limiter = AdaptiveConcurrencyLimiter(
+        "test", initial_limit=20, min_limit=15, target_latency=0, backoff_ratio=0.1
+    )
+
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release({}, overloaded=True)
+
+    assert limiter.limit == 15
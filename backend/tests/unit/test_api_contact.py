@@ -1,9 +1,15 @@
 """Tests for contact form API endpoint."""
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
 
+from app.api.contact import contact_admission, contact_deadline
+from app.config import get_settings
+from app.services.idempotency import IdempotencyStore
+from app.services.rate_limiter import RateLimiter, RateLimitVerdict
+
 
 @pytest.mark.asyncio
 async def test_submit_contact_success(
@@ -195,3 +201,321 @@ async def test_submit_contact_rate_limit(
     
     assert response.status_code == 429
     assert "rate limit" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_rate_limit_headers(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that 429 responses carry X-RateLimit-* and a precise Retry-After."""
+    denied = RateLimitVerdict(allowed=False, limit=5, remaining=0, reset_after=41.2)
+
+    with patch("app.api.contact.rate_limiter") as limiter:
+        limiter.is_allowed = AsyncMock(return_value=denied)
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "42"
+    assert response.headers["X-RateLimit-Limit"] == "5"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    limiter.get_remaining.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_async_ack(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that async-ack mode answers 202 once the message is buffered."""
+    with (
+        patch.object(get_settings(), "kafka_async_ack", True),
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        producer.enqueue_contact_message = AsyncMock(return_value=True)
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    producer.enqueue_contact_message.assert_called_once()
+    producer.send_contact_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_falls_back_to_outbox(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that a Kafka failure is absorbed by the outbox instead of a 503."""
+    with (
+        patch("app.api.contact.kafka_producer") as producer,
+        patch("app.api.contact.outbox") as outbox,
+    ):
+        producer.send_contact_message = AsyncMock(return_value=False)
+        outbox.enabled = True
+        outbox.append = AsyncMock(return_value=True)
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    outbox.append.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_batch(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+):
+    """Test that a batch is published at once and reports per-item results."""
+    invalid = {**sample_contact_data, "name": ""}
+    missing_contact = {**sample_contact_data, "channels": ["vk"]}
+
+    with (
+        patch.object(get_settings(), "batch_api_key", "batch-key"),
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        producer.send_contact_messages = AsyncMock(return_value=[True, False])
+        response = await test_client.post(
+            "/api/public/contact/batch",
+            json={"items": [sample_contact_data, invalid, missing_contact, sample_contact_data]},
+            headers={"api-key": "batch-key"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["queued"], data["rejected"], data["failed"]) == (1, 2, 1)
+    assert [r["status"] for r in data["results"]] == ["queued", "rejected", "rejected", "failed"]
+    assert data["results"][0]["id"] is not None
+    assert "vk" in data["results"][2]["error"]
+    assert len(producer.send_contact_messages.call_args.args[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_batch_requires_batch_key(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that the public key cannot be used for bulk ingestion."""
+    response = await test_client.post(
+        "/api/public/contact/batch",
+        json={"items": [sample_contact_data]},
+        headers={"api-key": valid_api_key},
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_deadline_exceeded(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that a slow Kafka send fails fast with 504 once the budget is spent."""
+    async def slow_send(message):
+        await asyncio.sleep(1)
+        return True
+
+    allowed = RateLimitVerdict(allowed=True, limit=5, remaining=4, reset_after=60)
+    with (
+        patch.object(contact_deadline, "seconds", 0.05),
+        patch("app.api.contact.rate_limiter") as limiter,
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        limiter.is_allowed = AsyncMock(return_value=allowed)
+        producer.send_contact_message = slow_send
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 504
+    assert "kafka" in response.json()["detail"]
+    assert contact_deadline.stats()["timeouts"]["kafka"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_slow_kafka_falls_back_to_outbox(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that a hanging Kafka send leaves enough of the budget for the outbox."""
+
+    async def slow_send(message):
+        await asyncio.sleep(1)
+        return True
+
+    allowed = RateLimitVerdict(allowed=True, limit=5, remaining=4, reset_after=60)
+    with (
+        patch.object(contact_deadline, "seconds", 0.2),
+        patch.object(get_settings(), "contact_outbox_reserve_seconds", 0.1),
+        patch("app.api.contact.rate_limiter") as limiter,
+        patch("app.api.contact.kafka_producer") as producer,
+        patch("app.api.contact.outbox") as outbox,
+    ):
+        limiter.is_allowed = AsyncMock(return_value=allowed)
+        producer.send_contact_message = slow_send
+        outbox.enabled = True
+        outbox.append = AsyncMock(return_value=True)
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 200
+    outbox.append.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_hung_rate_limiter_fails_open(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+    mock_kafka_producer: AsyncMock,
+):
+    """Test that a rate limit check cut short by its timeout trips the breaker, not a 504."""
+
+    async def hung_check(identifier):
+        await asyncio.sleep(1)
+
+    limiter = RateLimiter()
+    with (
+        patch.object(get_settings(), "contact_rate_limit_timeout_seconds", 0.05),
+        patch.object(limiter, "is_allowed", hung_check),
+        patch("app.api.contact.rate_limiter", limiter),
+        patch("app.api.contact.kafka_producer", mock_kafka_producer),
+    ):
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 200
+    assert limiter.breaker.stats()["consecutive_failures"] == 1
+    mock_kafka_producer.send_contact_message.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_idempotency_key_replays(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+    fake_redis,
+):
+    """Test that a retried request with the same Idempotency-Key is not published twice."""
+    allowed = RateLimitVerdict(allowed=True, limit=5, remaining=4, reset_after=60)
+    headers = {"api-key": valid_api_key, "Idempotency-Key": "retry-1"}
+
+    with (
+        patch("app.api.contact.idempotency_store", IdempotencyStore(lambda: fake_redis)),
+        patch("app.api.contact.rate_limiter") as limiter,
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        limiter.is_allowed = AsyncMock(return_value=allowed)
+        producer.send_contact_message = AsyncMock(return_value=True)
+        first = await test_client.post(
+            "/api/public/contact", json=sample_contact_data, headers=headers
+        )
+        second = await test_client.post(
+            "/api/public/contact", json=sample_contact_data, headers=headers
+        )
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == second.json()["id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+    producer.send_contact_message.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_idempotency_key_requires_api_key(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    fake_redis,
+):
+    """Test that a stored response is not replayed to a caller with a wrong API key."""
+    store = IdempotencyStore(lambda: fake_redis)
+    await store.complete("retry-1", "fp", 200, {"status": "queued"})
+
+    with patch("app.api.contact.idempotency_store", store):
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": "wrong-key", "Idempotency-Key": "retry-1"},
+        )
+
+    assert response.status_code == 401
+    assert "Idempotent-Replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_idempotency_key_kept_after_kafka_timeout(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+    fake_redis,
+):
+    """Test that a send cut short by the deadline keeps the key claimed, not released."""
+
+    async def slow_send(message):
+        await asyncio.sleep(1)
+        return True
+
+    allowed = RateLimitVerdict(allowed=True, limit=5, remaining=4, reset_after=60)
+    with (
+        patch.object(contact_deadline, "seconds", 0.05),
+        patch("app.api.contact.idempotency_store", IdempotencyStore(lambda: fake_redis)),
+        patch("app.api.contact.rate_limiter") as limiter,
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        limiter.is_allowed = AsyncMock(return_value=allowed)
+        producer.send_contact_message = slow_send
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key, "Idempotency-Key": "retry-1"},
+        )
+
+    assert response.status_code == 504
+    assert await fake_redis.exists("idempotency:retry-1")
+
+
+@pytest.mark.asyncio
+async def test_submit_contact_sheds_load(
+    test_client: AsyncClient,
+    sample_contact_data: dict,
+    valid_api_key: str,
+):
+    """Test that requests over the adaptive limit get 503 with Retry-After."""
+    with (
+        patch.object(contact_admission, "try_acquire", return_value=False),
+        patch("app.api.contact.kafka_producer") as producer,
+    ):
+        response = await test_client.post(
+            "/api/public/contact",
+            json=sample_contact_data,
+            headers={"api-key": valid_api_key},
+        )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    producer.send_contact_message.assert_not_called()
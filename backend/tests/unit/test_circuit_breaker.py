@@ -0,0 +1,81 @@
+"""Tests for circuit breaker."""
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis.asyncio as redis
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.rate_limiter import RateLimiter
+
+
+def test_circuit_breaker_opens_after_threshold():
+    """Test that consecutive failures open the circuit."""
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_circuit_breaker_success_resets_failures():
+    """Test that a success resets the consecutive failure count."""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_breaker_half_open_single_probe():
+    """Test that only one probe is let through after the cool-down."""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_circuit_breaker_failed_probe_reopens():
+    """Test that a failed probe re-opens the circuit."""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_skips_redis_when_circuit_open():
+    """Test that the rate limiter fails open without calling Redis once tripped."""
+    script = AsyncMock(side_effect=redis.ConnectionError("down"))
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = MagicMock()
+    rate_limiter._redis.register_script.return_value = script
+    threshold = rate_limiter._settings.redis_breaker_failure_threshold
+
+    for _ in range(threshold):
+        assert (await rate_limiter.is_allowed("test-ip-cb")).allowed is True
+    assert script.call_count == threshold
+
+    verdict = await rate_limiter.is_allowed("test-ip-cb")
+
+    assert verdict.allowed is True
+    assert script.call_count == threshold
+    assert rate_limiter.stats()["circuit_breaker"]["state"] == "open"
@@ -0,0 +1,53 @@
+"""Tests for client address resolution and rate limit bucketing."""
+import ipaddress
+
+from app.services.client_ip import (
+    TrustedProxies,
+    rate_limit_bucket,
+    resolve_client_ip,
+)
+
+
+def test_trusted_proxies_membership():
+    """Test CIDR membership across address families and prefix lengths."""
+    proxies = TrustedProxies(["10.0.0.0/8", "192.168.1.5/32", "fc00::/7", "not-a-cidr"])
+
+    assert ipaddress.ip_address("10.20.30.40") in proxies
+    assert ipaddress.ip_address("192.168.1.5") in proxies
+    assert ipaddress.ip_address("192.168.1.6") not in proxies
+    assert ipaddress.ip_address("fd12::1") in proxies
+    assert ipaddress.ip_address("2001:db8::1") not in proxies
+
+
+def test_forwarded_for_ignored_from_untrusted_peer():
+    """Test that clients cannot spoof X-Forwarded-For directly."""
+    client = resolve_client_ip("203.0.113.9", "1.2.3.4", None)
+
+    assert client == "203.0.113.9"
+
+
+def test_forwarded_for_skips_trusted_hops():
+    """Test that the rightmost untrusted hop is used as the client address."""
+    client = resolve_client_ip("10.0.0.2", "1.2.3.4, 198.51.100.7, 10.0.0.3", None)
+
+    assert client == "198.51.100.7"
+
+
+def test_real_ip_from_trusted_peer():
+    """Test X-Real-IP fallback behind a trusted proxy."""
+    assert resolve_client_ip("127.0.0.1", None, "198.51.100.8") == "198.51.100.8"
+    assert resolve_client_ip(None, None, None) == "unknown"
+
+
+def test_rate_limit_bucket_ipv6_prefix():
+    """Test that rotating addresses within a /64 share a single bucket."""
+    buckets = {rate_limit_bucket(f"2001:db8:1:2::{i:x}") for i in range(1000)}
+
+    assert buckets == {"2001:db8:1:2::/64"}
+
+
+def test_rate_limit_bucket_ipv4():
+    """Test IPv4 normalisation, including IPv4-mapped IPv6."""
+    assert rate_limit_bucket("203.0.113.7") == "203.0.113.7"
+    assert rate_limit_bucket("::ffff:203.0.113.7") == "203.0.113.7"
+    assert rate_limit_bucket("garbage") == "garbage"
@@ -0,0 +1,73 @@
+"""Tests for the database service."""
+from collections.abc import Callable
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.database.service import DatabaseService, insert_contacts_statement
+from app.models import ContactMessage
+
+
+def test_insert_contacts_statement_skips_existing_ids():
+    """Test that the bulk insert ignores conflicting ids and returns inserted ones."""
+    sql = str(insert_contacts_statement().compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (id) DO NOTHING" in sql
+    assert "RETURNING contacts.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_save_contacts_writes_batch_in_one_transaction(
+    make_contact_message: Callable[..., ContactMessage],
+):
+    """Test that save_contacts executes one statement for all rows and commits once."""
+    messages = [make_contact_message(name="First"), make_contact_message(name="Second")]
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [messages[0].id]
+
+    session = AsyncMock()
+    session.execute.return_value = result
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+
+    service = DatabaseService()
+    service._session_factory = factory
+
+    inserted = await service.save_contacts(messages)
+
+    assert inserted == {messages[0].id}
+    session.execute.assert_awaited_once()
+    rows = session.execute.await_args.args[1]
+    assert [row["id"] for row in rows] == [m.id for m in messages]
+    assert rows[0]["processed_at"] == rows[1]["processed_at"]
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_save_contacts_empty_batch():
+    """Test that an empty batch does not open a session."""
+    service = DatabaseService()
+    service._session_factory = MagicMock()
+
+    assert await service.save_contacts([]) == set()
+    service._session_factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_mark_notified_ignores_repeats(sample_contact_message: ContactMessage):
+    """Test that recording a sent notification twice does not fail on the primary key."""
+    session = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+
+    service = DatabaseService()
+    service._session_factory = factory
+
+    await service.mark_notified(sample_contact_message.id)
+
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO contact_notifications" in sql
+    assert "ON CONFLICT (id) DO NOTHING" in sql
+    session.commit.assert_awaited_once()
@@ -0,0 +1,64 @@
+"""Tests for per-request deadline budgets."""
+import asyncio
+
+import pytest
+
+from app.services.deadline import DeadlineBudget, DeadlineExceededError
+
+
+@pytest.mark.asyncio
+async def test_deadline_stages_share_budget():
+    """Test that a later stage only gets the time left by earlier ones."""
+    budget = DeadlineBudget("test", 0.1)
+    deadline = budget.start()
+
+    assert await deadline.run("first", asyncio.sleep(0.06, result="ok")) == "ok"
+
+    with pytest.raises(DeadlineExceededError) as exc_info:
+        await deadline.run("second", asyncio.sleep(0.06))
+
+    assert exc_info.value.stage == "second"
+    assert budget.stats()["timeouts"] == {"second": 1}
+
+
+@pytest.mark.asyncio
+async def test_deadline_exhausted_skips_stage():
+    """Test that a stage is not started once the budget is spent."""
+    budget = DeadlineBudget("test", 0.01)
+    deadline = budget.start()
+    await asyncio.sleep(0.02)
+    started = False
+
+    async def stage() -> None:
+        nonlocal started
+        started = True
+
+    with pytest.raises(DeadlineExceededError):
+        await deadline.run("kafka", stage())
+
+    assert started is False
+    assert deadline.remaining() == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_disabled():
+    """Test that a zero budget never times out."""
+    deadline = DeadlineBudget("test", 0).start()
+
+    assert await deadline.run("kafka", asyncio.sleep(0.01, result=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_stage_timeout_and_reserve():
+    """Test that a stage stops at its own timeout and leaves the reserve to later stages."""
+    budget = DeadlineBudget("test", 1.0)
+    deadline = budget.start()
+
+    with pytest.raises(DeadlineExceededError):
+        await deadline.run("rate_limit", asyncio.sleep(1), timeout=0.05)
+    with pytest.raises(DeadlineExceededError):
+        await deadline.run("kafka", asyncio.sleep(1), reserve=0.9)
+
+    assert 0.85 < deadline.remaining() <= 0.9
+    assert await deadline.run("outbox", asyncio.sleep(0.01, result="ok")) == "ok"
+    assert budget.stats()["timeouts"] == {"rate_limit": 1, "kafka": 1}
@@ -0,0 +1,106 @@
+"""Tests for the Redis-backed idempotency store."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.asyncio import Redis
+
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.idempotency import IdempotencyConflictError, IdempotencyStore
+
+
+@pytest.mark.asyncio
+async def test_idempotency_replays_completed_response(fake_redis: Redis):
+    """Test that a repeated key gets the stored response."""
+    store = IdempotencyStore(lambda: fake_redis)
+
+    assert await store.begin("key-1", "fp") is None
+    await store.complete("key-1", "fp", 202, {"status": "queued"})
+
+    stored = await store.begin("key-1", "fp")
+
+    assert stored is not None
+    assert (stored.status_code, stored.body) == (202, {"status": "queued"})
+    assert store.stats()["replayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idempotency_concurrent_duplicate_waits(fake_redis: Redis):
+    """Test that a duplicate arriving mid-flight waits for the first result."""
+    store = IdempotencyStore(lambda: fake_redis)
+    assert await store.begin("key-1", "fp") is None
+
+    waiter = asyncio.create_task(store.begin("key-1", "fp"))
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+
+    await store.complete("key-1", "fp", 200, {"status": "queued"})
+    stored = await asyncio.wait_for(waiter, 1)
+
+    assert stored.body == {"status": "queued"}
+    assert store.stats()["waited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idempotency_gives_up_waiting_after_max_wait(fake_redis: Redis):
+    """Test that a duplicate still in flight after the wait limit is a conflict."""
+    store = IdempotencyStore(lambda: fake_redis)
+    assert await store.begin("key-1", "fp") is None
+
+    with pytest.raises(IdempotencyConflictError) as exc_info:
+        await asyncio.wait_for(store.begin("key-1", "fp", max_wait=0.1), 1)
+
+    assert exc_info.value.reason == "in_progress"
+
+
+@pytest.mark.asyncio
+async def test_idempotency_rejects_different_body(fake_redis: Redis):
+    """Test that reusing a key for another request body is a conflict."""
+    store = IdempotencyStore(lambda: fake_redis)
+    await store.begin("key-1", "fp-a")
+
+    with pytest.raises(IdempotencyConflictError) as exc_info:
+        await store.begin("key-1", "fp-b")
+
+    assert exc_info.value.reason == "mismatch"
+
+
+@pytest.mark.asyncio
+async def test_idempotency_release_allows_retry(fake_redis: Redis):
+    """Test that a released claim can be taken by the retry."""
+    store = IdempotencyStore(lambda: fake_redis)
+    await store.begin("key-1", "fp")
+
+    await store.release("key-1")
+
+    assert await store.begin("key-1", "fp") is None
+
+
+@pytest.mark.asyncio
+async def test_idempotency_without_redis():
+    """Test that requests are processed normally when Redis is not connected."""
+    store = IdempotencyStore(lambda: None)
+
+    assert await store.begin("key-1", "fp") is None
+
+
+@pytest.mark.asyncio
+async def test_idempotency_hung_redis_trips_breaker():
+    """Test that slow Redis calls time out, count as breaker failures and are then skipped."""
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    redis = MagicMock(set=hang)
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout=60)
+    store = IdempotencyStore(lambda: redis, breaker)
+    store._settings = store._settings.model_copy(
+        update={"idempotency_redis_timeout_seconds": 0.01}
+    )
+
+    assert await store.begin("key-1", "fp") is None
+    assert await store.begin("key-1", "fp") is None
+
+    redis.set = AsyncMock()
+    assert await store.begin("key-1", "fp") is None
+    redis.set.assert_not_called()  # Breaker open: Redis is not contacted
@@ -0,0 +1,90 @@
+"""Tests for the Kafka contact message codec."""
+import json
+from collections.abc import Callable
+
+import pytest
+
+from app.kafka.codec import (
+    FORMAT_HEADER,
+    JSON_FORMAT,
+    MSGPACK_FORMAT,
+    decode_contact,
+    encode_contact,
+    encode_dead_letter,
+    wire_headers,
+)
+from app.models import ContactMessage
+
+
+@pytest.fixture
+def message(make_contact_message: Callable[..., ContactMessage]) -> ContactMessage:
+    """Contact message with the optional client address set."""
+    return make_contact_message(ip_address="203.0.113.7")
+
+
+def test_codec_round_trip(message: ContactMessage):
+    """Test that encoding then decoding returns an equal message."""
+
+    assert decode_contact(encode_contact(message)) == message
+
+
+def test_codec_matches_legacy_json(message: ContactMessage):
+    """Test that the codec reads and writes the previous JSON format."""
+    legacy = json.dumps(message.model_dump(mode="json")).encode("utf-8")
+
+    assert json.loads(encode_contact(message)) == json.loads(legacy)
+    assert decode_contact(legacy) == message
+
+
+def test_dead_letter_embeds_original_json(message: ContactMessage):
+    """Test that DLQ records keep the original message as a JSON object."""
+    data = encode_contact(message)
+
+    envelope = json.loads(encode_dead_letter(data, "boom"))
+
+    assert envelope["original_message"] == json.loads(data)
+    assert envelope["error"] == "boom"
+
+
+def test_dead_letter_embeds_invalid_payload_as_string():
+    """Test that undecodable records still reach the DLQ."""
+    envelope = json.loads(encode_dead_letter(b"\xffnot json", "invalid"))
+
+    assert envelope["original_message"].endswith("not json")
+    assert envelope["error"] == "invalid"
+
+
+def test_msgpack_round_trip_is_smaller(message: ContactMessage):
+    """Test that the binary format round-trips and is smaller than JSON."""
+    headers = wire_headers(MSGPACK_FORMAT)
+
+    packed = encode_contact(message, MSGPACK_FORMAT)
+
+    assert decode_contact(packed, headers) == message
+    assert len(packed) < len(encode_contact(message))
+
+
+def test_decode_without_header_is_legacy_json(message: ContactMessage):
+    """Test that records without a format header decode as JSON."""
+    legacy = json.dumps(message.model_dump(mode="json")).encode("utf-8")
+
+    assert decode_contact(legacy, []) == message
+    assert decode_contact(legacy, wire_headers(JSON_FORMAT)) == message
+
+
+def test_decode_unknown_schema_version(message: ContactMessage):
+    """Test that an unknown schema version is rejected."""
+    packed = encode_contact(message, MSGPACK_FORMAT)
+
+    with pytest.raises(ValueError):
+        decode_contact(packed, [(FORMAT_HEADER, b"contact-msgpack/99")])
+
+
+def test_dead_letter_converts_binary_to_json(message: ContactMessage):
+    """Test that binary records are readable in the DLQ."""
+    packed = encode_contact(message, MSGPACK_FORMAT)
+
+    envelope = json.loads(encode_dead_letter(packed, "boom", wire_headers(MSGPACK_FORMAT)))
+
+    assert envelope["original_message"]["id"] == str(message.id)
+    assert envelope["original_message"]["contacts"]["telegram"] == message.contacts.telegram
@@ -0,0 +1,208 @@
+"""Tests for the Kafka consumer service."""
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiokafka import TopicPartition
+
+from app.config import Settings
+from app.kafka.codec import JSON_FORMAT, encode_contact
+from app.kafka.consumer import KafkaConsumerService, _PartitionOffsets
+from app.models import ContactMessage
+
+TP0 = TopicPartition("contacts", 0)
+TP1 = TopicPartition("contacts", 1)
+
+
+def make_record(offset: int, key: bytes | None = None) -> MagicMock:
+    """Create a consumer record stub."""
+    record = MagicMock()
+    record.offset = offset
+    record.key = key
+    record.value = f"{key}:{offset}".encode()
+    record.headers = []
+    return record
+
+
+def make_contact_record(offset: int, message: ContactMessage) -> MagicMock:
+    """Create a record carrying an encoded contact message."""
+    record = make_record(offset, str(message.id).encode())
+    record.value = encode_contact(message, JSON_FORMAT)
+    return record
+
+
+@pytest.fixture
+def make_service(make_kafka_service: Callable[..., Any]) -> Callable[..., KafkaConsumerService]:
+    """Consumer service that fetches `batches` and then stops."""
+
+    def make(batches: list[dict], **settings) -> KafkaConsumerService:
+        with patch("app.kafka.consumer.DatabaseService"):
+            service = make_kafka_service(
+                KafkaConsumerService,
+                "app.kafka.consumer",
+                batches,
+                {TP0, TP1},
+                Settings(**settings),
+            )
+        service._process_message = AsyncMock()
+        return service
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_consumer_commits_once_per_batch(make_service: Callable[..., KafkaConsumerService]):
+    """Test that a fetched batch is committed with explicit offsets in one call."""
+    batch = {TP0: [make_record(5), make_record(6)], TP1: [make_record(9)]}
+    service = make_service([batch], kafka_consumer_max_records=50)
+
+    await service.run()
+
+    assert service._process_message.await_count == 3
+    service._consumer.commit.assert_awaited_once_with({TP0: 7, TP1: 10})
+    assert service._consumer.getmany.call_args.kwargs["max_records"] == 50
+
+
+@pytest.mark.asyncio
+async def test_consumer_commit_interval_defers_commits(
+    make_service: Callable[..., KafkaConsumerService]
+):
+    """Test that commits wait for the interval and are flushed on revoke/stop."""
+    batches = [{TP0: [make_record(1)]}, {TP0: [make_record(2)]}]
+    service = make_service(batches, kafka_consumer_commit_interval_ms=60000)
+
+    await service.run()
+    service._consumer.commit.assert_not_awaited()
+
+    await service._commit_pending(force=True)
+    service._consumer.commit.assert_awaited_once_with({TP0: 3})
+
+
+@pytest.mark.asyncio
+async def test_consumer_skips_revoked_partitions(make_service: Callable[..., KafkaConsumerService]):
+    """Test that offsets of partitions no longer assigned are not committed."""
+    service = make_service([{TP0: [make_record(1)], TP1: [make_record(4)]}])
+    service._consumer.assignment.return_value = {TP1}
+
+    await service.run()
+
+    service._consumer.commit.assert_awaited_once_with({TP1: 5})
+
+
+def test_partition_offsets_commit_contiguous_prefix():
+    """Test that out-of-order completions only advance past a contiguous prefix."""
+    offsets = _PartitionOffsets()
+    for offset in (3, 4, 5):
+        offsets.start(offset)
+
+    assert offsets.complete(5) is None
+    assert offsets.complete(4) is None
+    assert offsets.complete(3) == 6
+
+
+@pytest.mark.asyncio
+async def test_consumer_slow_record_holds_back_commit_of_later_offsets(
+    make_service: Callable[..., KafkaConsumerService]
+):
+    """Test that a slow record is not skipped while later records complete."""
+    release = asyncio.Event()
+    batch = {TP0: [make_record(1, b"a"), make_record(2, b"b")], TP1: [make_record(7)]}
+    service = make_service([batch], kafka_consumer_max_concurrency=5)
+
+    async def process(data, headers, *args):
+        if service._process_message.await_count == 1:
+            await release.wait()
+
+    service._process_message.side_effect = process
+    run = asyncio.create_task(service.run())
+    await asyncio.sleep(0.01)
+
+    # Offset 2 and partition 1 are done, offset 1 is still in flight
+    assert service._pending_offsets.get(TP0) is None
+    assert service._pending_offsets[TP1] == 8
+
+    release.set()
+    await run
+    assert service._consumer.commit.await_args.args[0] == {TP0: 3, TP1: 8}
+
+
+@pytest.mark.asyncio
+async def test_consumer_same_key_runs_in_order_and_respects_limit(
+    make_service: Callable[..., KafkaConsumerService]
+):
+    """Test that records sharing a key run sequentially under the global limit."""
+    order = []
+    running = 0
+    peak = 0
+    batch = {
+        TP0: [make_record(0, b"k"), make_record(1, b"k"), make_record(2, b"x")],
+        TP1: [make_record(0, b"y"), make_record(1, b"z")],
+    }
+    service = make_service([batch], kafka_consumer_max_concurrency=2)
+
+    async def process(data, headers, *args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        order.append(data)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    service._process_message.side_effect = process
+    await service.run()
+
+    assert peak == 2
+    assert order.index(b"b'k':0") < order.index(b"b'k':1")
+    committed = {}
+    for commit in service._consumer.commit.await_args_list:
+        committed.update(commit.args[0])
+    assert committed == {TP0: 3, TP1: 2}
+
+
+@pytest.mark.asyncio
+async def test_consumer_bulk_saves_batch_and_notifies_stored_ids(
+    make_contact_message: Callable[..., ContactMessage],
+    make_service: Callable[..., KafkaConsumerService],
+):
+    """Test that a batch is saved in one call and already stored ids are still notified."""
+    new_message = make_contact_message(name="New")
+    stored_message = make_contact_message(name="Stored")
+    records = [make_contact_record(0, new_message), make_contact_record(1, stored_message)]
+    service = make_service([{TP0: records}])
+    del service._process_message
+    service._db.save_contacts = AsyncMock(return_value={new_message.id})
+
+    await service.run()
+
+    service._db.save_contacts.assert_awaited_once()
+    assert len(service._db.save_contacts.await_args.args[0]) == 2
+    service._db.save_contact.assert_not_called()
+    notified = [call.kwargs for call in service._producer.send_and_wait.await_args_list]
+    assert {n["key"]: n["value"] for n in notified} == {r.key: r.value for r in records}
+    assert {n["topic"] for n in notified} == {service._settings.kafka_notify_topic}
+    service._consumer.commit.assert_awaited_once_with({TP0: 2})
+
+
+@pytest.mark.asyncio
+async def test_consumer_falls_back_to_single_inserts(
+    make_contact_message: Callable[..., ContactMessage],
+    make_service: Callable[..., KafkaConsumerService],
+):
+    """Test that a failed bulk write saves each record on its own."""
+    records = [
+        make_contact_record(offset, make_contact_message(name=f"Visitor {offset}"))
+        for offset in range(3)
+    ]
+    service = make_service([{TP0: records}])
+    del service._process_message
+    service._db.save_contacts = AsyncMock(side_effect=RuntimeError("bad row"))
+    service._db.save_contact = AsyncMock()
+    service._publish_notification = AsyncMock()
+
+    await service.run()
+
+    assert service._db.save_contact.await_count == 3
+    assert service._publish_notification.await_count == 3
+    service._consumer.commit.assert_awaited_once_with({TP0: 3})
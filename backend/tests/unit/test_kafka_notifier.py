@@ -0,0 +1,174 @@
+"""Tests for the Telegram notification stage."""
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiokafka import TopicPartition
+
+from app.config import Settings
+from app.kafka.codec import JSON_FORMAT, encode_contact
+from app.kafka.notifier import (
+    ATTEMPT_HEADER,
+    NOT_BEFORE_HEADER,
+    NotificationConsumerService,
+    retry_headers,
+)
+from app.models import ContactMessage
+
+NOTIFY = TopicPartition("notify", 0)
+RETRY_10 = TopicPartition("notify-retry-10s", 0)
+
+
+def make_record(offset: int, message: ContactMessage, headers: list | None = None) -> MagicMock:
+    """Create a notify record stub carrying an encoded contact message."""
+    record = MagicMock()
+    record.offset = offset
+    record.key = str(message.id).encode()
+    record.value = encode_contact(message, JSON_FORMAT)
+    record.headers = headers or []
+    return record
+
+
+@pytest.fixture
+def make_service(
+    make_kafka_service: Callable[..., Any]
+) -> Callable[[list[dict]], NotificationConsumerService]:
+    """Notifier that fetches `batches` and then stops."""
+    settings = Settings(kafka_notify_topic="notify", kafka_notify_retry_delays="10,60")
+
+    def make(batches: list[dict]) -> NotificationConsumerService:
+        with patch("app.kafka.notifier.DatabaseService"):
+            service = make_kafka_service(
+                NotificationConsumerService,
+                "app.kafka.notifier",
+                batches,
+                {NOTIFY, RETRY_10},
+                settings,
+            )
+        notified: set = set()
+        service._db.is_notified = AsyncMock(side_effect=notified.__contains__)
+        service._db.mark_notified = AsyncMock(side_effect=notified.add)
+        return service
+
+    return make
+
+
+def header(headers: list, name: str) -> bytes | None:
+    """Value of a record header."""
+    return dict(headers).get(name)
+
+
+@pytest.mark.asyncio
+async def test_notifier_delivers_and_commits(
+    make_service: Callable[[list[dict]], NotificationConsumerService],
+    make_contact_message: Callable[..., ContactMessage],
+):
+    """Test that a delivered notification is committed without republishing."""
+    records = [make_record(4, make_contact_message()), make_record(5, make_contact_message())]
+    service = make_service([{NOTIFY: records}])
+
+    with patch("app.kafka.notifier.send_notification", AsyncMock(return_value=True)) as send:
+        await service.run()
+
+    assert send.await_count == 2
+    service._producer.send_and_wait.assert_not_called()
+    service._consumer.commit.assert_awaited_once_with({NOTIFY: 6})
+
+
+@pytest.mark.asyncio
+async def test_notifier_sends_repeated_message_once(
+    make_service: Callable[[list[dict]], NotificationConsumerService],
+    sample_contact_message: ContactMessage,
+):
+    """Test that a message published twice (redelivery, relay, replay) is notified once."""
+    service = make_service(
+        [
+            {NOTIFY: [make_record(0, sample_contact_message)]},
+            {NOTIFY: [make_record(1, sample_contact_message)]},
+        ]
+    )
+
+    with patch("app.kafka.notifier.send_notification", AsyncMock(return_value=True)) as send:
+        await service.run()
+
+    send.assert_awaited_once()
+    service._db.mark_notified.assert_awaited_once_with(sample_contact_message.id)
+    service._consumer.commit.assert_awaited_with({NOTIFY: 2})
+
+
+@pytest.mark.asyncio
+async def test_notifier_failure_moves_to_first_retry_tier(
+    make_service: Callable[[list[dict]], NotificationConsumerService],
+    sample_contact_message: ContactMessage,
+):
+    """Test that a failed delivery is republished to the 10 s retry topic, not slept on."""
+    record = make_record(0, sample_contact_message, [("content-format", b"json")])
+    service = make_service([{NOTIFY: [record]}])
+
+    with patch("app.kafka.notifier.send_notification", AsyncMock(return_value=False)):
+        await service.run()
+
+    topic = service._producer.send_and_wait.await_args.args[0]
+    kwargs = service._producer.send_and_wait.await_args.kwargs
+    assert topic == "notify-retry-10s"
+    assert kwargs["value"] == record.value
+    assert kwargs["key"] == record.key
+    assert header(kwargs["headers"], "content-format") == b"json"
+    assert header(kwargs["headers"], ATTEMPT_HEADER) == b"1"
+    not_before = int(header(kwargs["headers"], NOT_BEFORE_HEADER)) / 1000
+    assert 9 < not_before - time.time() <= 10
+    service._consumer.commit.assert_awaited_once_with({NOTIFY: 1})
+
+
+@pytest.mark.asyncio
+async def test_notifier_last_tier_goes_to_dlq(
+    make_service: Callable[[list[dict]], NotificationConsumerService],
+    sample_contact_message: ContactMessage,
+):
+    """Test that a notification failing in the last retry tier is dead-lettered."""
+    headers = retry_headers([], attempt=2, not_before_ms=0)
+    service = make_service([{RETRY_10: [make_record(3, sample_contact_message, headers)]}])
+
+    with patch("app.kafka.notifier.send_notification", AsyncMock(side_effect=RuntimeError)):
+        await service.run()
+
+    sent = service._producer.send_and_wait.await_args
+    assert sent.args[0] == service._settings.kafka_dlq_topic
+    assert json.loads(sent.kwargs["value"])["error"] == "telegram_notification_failed"
+    service._consumer.commit.assert_awaited_once_with({RETRY_10: 4})
+
+
+@pytest.mark.asyncio
+async def test_notifier_pauses_partition_until_record_is_due(
+    make_service: Callable[[list[dict]], NotificationConsumerService],
+    make_contact_message: Callable[..., ContactMessage],
+):
+    """Test that a retry record that is not due pauses only its partition."""
+    due = retry_headers([], attempt=1, not_before_ms=0)
+    later = retry_headers([], attempt=1, not_before_ms=int((time.time() + 30) * 1000))
+    batch = {
+        RETRY_10: [
+            make_record(7, make_contact_message(), due),
+            make_record(8, make_contact_message(), later),
+            make_record(9, make_contact_message(), due),
+        ],
+        NOTIFY: [make_record(0, make_contact_message())],
+    }
+    service = make_service([batch])
+
+    with patch("app.kafka.notifier.send_notification", AsyncMock(return_value=True)) as send:
+        await service.run()
+
+    assert send.await_count == 2
+    service._consumer.seek.assert_called_once_with(RETRY_10, 8)
+    service._consumer.pause.assert_called_once_with(RETRY_10)
+    service._consumer.commit.assert_awaited_once_with({RETRY_10: 8, NOTIFY: 1})
+
+    # Resumed once the record is due
+    service._resume_at[RETRY_10] = time.monotonic() - 1
+    service._resume_due()
+    service._consumer.resume.assert_called_once_with(RETRY_10)
+    assert RETRY_10 not in service._resume_at
@@ -1,9 +1,13 @@
 """Tests for Kafka producer service."""
+import asyncio
+from collections import deque
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 
-from app.models import ContactChannels, ContactFormRequest, ContactMessage, Contacts
+from app.config import Settings
+from app.models import ContactChannel, ContactFormRequest, ContactInfo, ContactMessage
 from app.services.kafka_producer import KafkaProducerService
 
 
@@ -13,8 +17,8 @@ def sample_contact_message() -> ContactMessage:
     form_request = ContactFormRequest(
         name="John Doe",
         message="Test message",
-        channels=[ContactChannels.telegram],
-        contacts=Contacts(telegram="@johndoe"),
+        channels=[ContactChannel.TELEGRAM],
+        contacts=ContactInfo(telegram="@johndoe"),
     )
     return ContactMessage(
         name=form_request.name,
@@ -105,3 +109,186 @@ async def test_kafka_producer_idempotent_start():
         
         # Producer should be initialized only once
         assert mock_producer_class.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_enqueue_confirms_in_background(
+    sample_contact_message: ContactMessage,
+):
+    """Test that enqueue returns before delivery and counts the outcome later."""
+    delivery = asyncio.get_running_loop().create_future()
+    mock_producer = AsyncMock()
+    mock_producer.send = AsyncMock(return_value=delivery)
+
+    service = KafkaProducerService()
+    service._producer = mock_producer
+
+    assert await service.enqueue_contact_message(sample_contact_message) is True
+    assert service.stats()["pending"] == 1
+
+    delivery.set_result(MagicMock())
+    await asyncio.sleep(0)
+
+    assert service.stats() == {
+        "pending": 0,
+        "delivered": 1,
+        "failed": 0,
+        "awaiting_replay": 0,
+        "dropped": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_enqueue_failure_is_replayed(
+    sample_contact_message: ContactMessage,
+):
+    """Test that failed background deliveries are kept and replayed."""
+    delivery = asyncio.get_running_loop().create_future()
+    mock_producer = AsyncMock()
+    mock_producer.send = AsyncMock(return_value=delivery)
+    mock_producer.send_and_wait = AsyncMock()
+
+    service = KafkaProducerService()
+    service._producer = mock_producer
+
+    await service.enqueue_contact_message(sample_contact_message)
+    delivery.set_exception(ConnectionError("broker unavailable"))
+    await asyncio.sleep(0)
+
+    assert service.stats()["failed"] == 1
+    assert service.stats()["awaiting_replay"] == 1
+
+    assert await service.replay_failed() == 1
+    assert service.stats()["awaiting_replay"] == 0
+    mock_producer.send_and_wait.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_counts_messages_evicted_from_full_replay_buffer(
+    sample_contact_message: ContactMessage,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Test that a full replay buffer logs and counts each message it evicts."""
+    mock_producer = AsyncMock()
+    service = KafkaProducerService()
+    service._failed = deque(maxlen=2)
+    service._producer = mock_producer
+
+    messages = [sample_contact_message.model_copy(update={"id": uuid4()}) for _ in range(3)]
+    for message in messages:
+        delivery = asyncio.get_running_loop().create_future()
+        delivery.set_exception(ConnectionError("broker unavailable"))
+        mock_producer.send = AsyncMock(return_value=delivery)
+        await service.enqueue_contact_message(message)
+    await asyncio.sleep(0)
+
+    assert service.stats()["awaiting_replay"] == 2
+    assert service.stats()["dropped"] == 1
+    assert list(service._failed) == messages[1:]
+    assert str(messages[0].id) in caplog.text
+
+
+def test_kafka_producer_options_profile_and_overrides():
+    """Test that explicit settings override the selected producer profile."""
+    settings = Settings(
+        kafka_producer_profile="throughput",
+        kafka_linger_ms=5,
+        kafka_compression_type="none",
+    )
+
+    options = settings.kafka_producer_options
+
+    assert options["linger_ms"] == 5
+    assert options["max_batch_size"] == 131072
+    assert options["compression_type"] is None
+
+
+def test_kafka_producer_options_unknown_profile():
+    """Test that an unknown profile is rejected."""
+    with pytest.raises(ValueError):
+        Settings(kafka_producer_profile="fastest").kafka_producer_options
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_start_applies_profile():
+    """Test that the resolved profile is passed to AIOKafkaProducer."""
+    with patch("app.services.kafka_producer.AIOKafkaProducer") as mock_producer_class:
+        mock_producer_class.return_value = AsyncMock()
+
+        service = KafkaProducerService()
+        service._settings = Settings(kafka_producer_profile="latency")
+        await service.start()
+
+    kwargs = mock_producer_class.call_args.kwargs
+    assert kwargs["linger_ms"] == 0
+    assert kwargs["request_timeout_ms"] == 10000
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_send_batch(sample_contact_message: ContactMessage):
+    """Test that a batch is fully buffered before deliveries are awaited."""
+    loop = asyncio.get_running_loop()
+    delivered, failed = loop.create_future(), loop.create_future()
+    delivered.set_result(MagicMock())
+    failed.set_exception(ConnectionError("broker unavailable"))
+
+    mock_producer = AsyncMock()
+    mock_producer.send = AsyncMock(side_effect=[delivered, failed])
+
+    service = KafkaProducerService()
+    service._producer = mock_producer
+
+    results = await service.send_contact_messages(
+        [sample_contact_message, sample_contact_message.model_copy()]
+    )
+
+    assert results == [True, False]
+    assert mock_producer.send.call_count == 2
+    mock_producer.send_and_wait.assert_not_called()
+
+
+def make_warmup_producer(partitions: set[int]) -> AsyncMock:
+    """Mock producer whose topics have `partitions`, led by broker id == partition."""
+    mock_producer = AsyncMock()
+    mock_producer.partitions_for = AsyncMock(return_value=partitions)
+    mock_producer.client = MagicMock()
+    mock_producer.client.cluster.leader_for_partition.side_effect = lambda tp: tp.partition
+    mock_producer.client.ready = AsyncMock(return_value=True)
+    return mock_producer
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_start_warms_up_metadata():
+    """Test that start loads topic metadata and connects to partition leaders in the background."""
+    mock_producer = make_warmup_producer({0, 1, 2})
+    with patch("app.services.kafka_producer.AIOKafkaProducer", return_value=mock_producer):
+        service = KafkaProducerService()
+        service._settings = Settings(kafka_topic_partitions=3)
+        await service.start()
+        assert service.ready is False  # Startup does not wait for the warm-up
+        await service._warmup_task
+
+    assert service.ready is True
+    assert service.warmup_status()["partitions"] == {
+        service._settings.kafka_topic: 3,
+        service._settings.kafka_dlq_topic: 3,
+    }
+    assert sorted(c.args[0] for c in mock_producer.client.ready.call_args_list) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_kafka_producer_warm_up_rejects_partition_mismatch():
+    """Test that an unexpected partition count keeps the producer not ready."""
+    mock_producer = make_warmup_producer({0})
+    with patch("app.services.kafka_producer.AIOKafkaProducer", return_value=mock_producer):
+        service = KafkaProducerService()
+        service._settings = Settings(kafka_topic_partitions=3, kafka_warmup_retry_seconds=3600)
+        await service.start()
+        await asyncio.sleep(0)  # Let the background warm-up run
+
+    assert service.ready is False
+    assert "expected 3" in service.warmup_status()["error"]
+
+    warmup_task = service._warmup_task
+    await service.stop()
+    assert warmup_task.cancelled()  # Awaited on shutdown, not left pending
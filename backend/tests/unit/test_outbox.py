@@ -0,0 +1,114 @@
+"""Tests for the durable local outbox."""
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.models import ContactMessage
+from app.services.outbox import LocalOutbox
+
+
+@pytest.fixture
+async def outbox_path(tmp_path: Path) -> AsyncGenerator[Path, None]:
+    """Enable the outbox with a journal in a temporary directory."""
+    path = tmp_path / "outbox.sqlite3"
+    settings = get_settings()
+    with (
+        patch.object(settings, "outbox_enabled", True),
+        patch.object(settings, "outbox_path", str(path)),
+        patch.object(settings, "outbox_relay_interval_seconds", 3600.0),
+    ):
+        yield path
+
+
+@pytest.mark.asyncio
+async def test_outbox_group_commits_concurrent_appends(
+    outbox_path: Path, make_contact_message: Callable[..., ContactMessage]
+):
+    """Test that concurrent appends share one commit and survive a restart."""
+    outbox = LocalOutbox()
+    await outbox.start(AsyncMock(return_value=False))
+
+    results = await asyncio.gather(*(outbox.append(make_contact_message(name=f"n{i}")) for i in range(20)))
+
+    assert all(results)
+    stats = await outbox.stats()
+    assert stats["depth"] == 20
+    assert stats["commits"] == 1
+    await outbox.stop()
+
+    reopened = LocalOutbox()
+    await reopened.start(AsyncMock(return_value=False))
+    assert await reopened.depth() == 20
+    await reopened.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_cancelled_append_does_not_block_others(
+    outbox_path: Path, make_contact_message: Callable[..., ContactMessage]
+):
+    """Test that a caller cancelled while waiting for the commit does not stall the batch."""
+    outbox = LocalOutbox()
+    await outbox.start(AsyncMock(return_value=False))
+
+    cancelled = asyncio.create_task(outbox.append(make_contact_message(name="n0")))
+    waiting = asyncio.create_task(outbox.append(make_contact_message(name="n1")))
+    await asyncio.sleep(0)  # Both appends join the same commit
+    cancelled.cancel()
+
+    assert await asyncio.wait_for(waiting, timeout=1) is True
+    assert (await outbox.stats())["commits"] == 1
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_preserves_ids_and_order(
+    outbox_path: Path, make_contact_message: Callable[..., ContactMessage]
+):
+    """Test that the relay forwards the stored messages unchanged, oldest first."""
+    messages = [make_contact_message(name=f"n{i}") for i in range(3)]
+    outbox = LocalOutbox()
+    await outbox.start(AsyncMock(return_value=False))
+    for message in messages:
+        await outbox.append(message)
+
+    sent: list[ContactMessage] = []
+
+    async def send(message: ContactMessage) -> bool:
+        sent.append(message)
+        return True
+
+    assert await outbox.relay_once(send) == 3
+    assert [m.id for m in sent] == [m.id for m in messages]
+    assert await outbox.depth() == 0
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_relay_stops_at_first_failure(
+    outbox_path: Path, make_contact_message: Callable[..., ContactMessage]
+):
+    """Test that a failed send keeps it and everything after it in the journal."""
+    outbox = LocalOutbox()
+    await outbox.start(AsyncMock(return_value=False))
+    for i in range(3):
+        await outbox.append(make_contact_message(name=f"n{i}"))
+
+    send = AsyncMock(side_effect=[True, False])
+
+    assert await outbox.relay_once(send) == 1
+    assert await outbox.depth() == 2
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_outbox_disabled_by_default(sample_contact_message: ContactMessage):
+    """Test that appends are refused when the outbox is not started."""
+    outbox = LocalOutbox()
+    await outbox.start(AsyncMock())
+
+    assert outbox.enabled is False
+    assert await outbox.append(sample_contact_message) is False
@@ -1,8 +1,19 @@
 """Tests for rate limiter service."""
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from pydantic import ValidationError
 from redis.asyncio import Redis
 
-from app.services.rate_limiter import RateLimiter
+from app.config import Settings
+from app.services.rate_limiter import (
+    LocalDenyCache,
+    RateLimitBatcher,
+    RateLimiter,
+    RateLimitVerdict,
+)
 
 
 @pytest.mark.asyncio
@@ -11,9 +22,9 @@ async def test_rate_limiter_first_request(fake_redis: Redis):
     rate_limiter = RateLimiter()
     rate_limiter._redis = fake_redis
     
-    allowed = await rate_limiter.is_allowed("test-ip-1")
+    verdict = await rate_limiter.is_allowed("test-ip-1")
     
-    assert allowed is True
+    assert verdict.allowed is True
 
 
 @pytest.mark.asyncio
@@ -24,8 +35,8 @@ async def test_rate_limiter_within_limit(fake_redis: Redis):
     
     # Make 3 requests (default limit)
     for _ in range(3):
-        allowed = await rate_limiter.is_allowed("test-ip-2")
-        assert allowed is True
+        verdict = await rate_limiter.is_allowed("test-ip-2")
+        assert verdict.allowed is True
 
 
 @pytest.mark.asyncio
@@ -39,8 +50,8 @@ async def test_rate_limiter_exceeds_limit(fake_redis: Redis):
         await rate_limiter.is_allowed("test-ip-3")
     
     # 4th request should be blocked
-    allowed = await rate_limiter.is_allowed("test-ip-3")
-    assert allowed is False
+    verdict = await rate_limiter.is_allowed("test-ip-3")
+    assert verdict.allowed is False
 
 
 @pytest.mark.asyncio
@@ -81,8 +92,8 @@ async def test_rate_limiter_different_ips_independent(fake_redis: Redis):
         await rate_limiter.is_allowed("test-ip-6")
     
     # IP 2 should still be allowed
-    allowed = await rate_limiter.is_allowed("test-ip-7")
-    assert allowed is True
+    verdict = await rate_limiter.is_allowed("test-ip-7")
+    assert verdict.allowed is True
 
 
 @pytest.mark.asyncio
@@ -91,10 +102,10 @@ async def test_rate_limiter_fail_open_on_error():
     rate_limiter = RateLimiter()
     # Don't set _redis, simulating connection failure
     
-    allowed = await rate_limiter.is_allowed("test-ip-8")
+    verdict = await rate_limiter.is_allowed("test-ip-8")
     
     # Should allow request when Redis is unavailable (fail-open)
-    assert allowed is True
+    assert verdict.allowed is True
 
 
 @pytest.mark.asyncio
@@ -107,3 +118,292 @@ async def test_rate_limiter_get_remaining_no_requests(fake_redis: Redis):
     
     # Should return full limit
     assert remaining == rate_limiter._settings.rate_limit_requests
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_concurrent_requests_are_atomic(fake_redis: Redis):
+    """Test that concurrent requests cannot exceed the limit."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    limit = rate_limiter._settings.rate_limit_requests
+
+    results = await asyncio.gather(
+        *(rate_limiter.is_allowed("test-ip-10") for _ in range(limit * 4))
+    )
+
+    assert sum(verdict.allowed for verdict in results) == limit
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_verdict_reports_remaining_and_reset(fake_redis: Redis):
+    """Test that a single script call returns allowed, remaining and reset time."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+
+    verdict = await rate_limiter.is_allowed("test-ip-11")
+
+    assert verdict.allowed is True
+    assert verdict.limit == rate_limiter._settings.rate_limit_requests
+    assert verdict.remaining == verdict.limit - 1
+    assert 0 < verdict.reset_after <= rate_limiter._settings.rate_limit_window_seconds
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_replaces_legacy_counter_key(fake_redis: Redis):
+    """Test that a legacy string counter does not break the sliding window."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    await fake_redis.set("ratelimit:contact:test-ip-12", "3")
+
+    verdict = await rate_limiter.is_allowed("test-ip-12")
+
+    assert verdict.allowed is True
+    assert await fake_redis.type("ratelimit:contact:test-ip-12") == "hash"
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_local_cache_answers_repeat_denials(fake_redis: Redis):
+    """Test that denials are served from the local tier without Redis calls."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    limit = rate_limiter._settings.rate_limit_requests
+
+    for _ in range(limit):
+        assert (await rate_limiter.is_allowed("test-ip-13")).allowed is True
+
+    rate_limiter._redis = AsyncMock(spec=Redis)
+    for _ in range(5):
+        assert (await rate_limiter.is_allowed("test-ip-13")).allowed is False
+
+    rate_limiter._redis.evalsha.assert_not_called()
+    stats = rate_limiter.stats()["local_cache"]
+    assert stats["hits"] == 5
+    assert stats["misses"] == limit
+
+    denied = await rate_limiter.is_allowed("test-ip-13")
+    assert denied.remaining == 0
+    assert denied.headers()["Retry-After"] == str(denied.retry_after)
+
+
+def test_local_deny_cache_expires_and_evicts():
+    """Test TTL expiry and LRU eviction of the local deny cache."""
+    cache = LocalDenyCache(max_size=2)
+
+    def exhausted(seconds: float) -> RateLimitVerdict:
+        return RateLimitVerdict(allowed=True, limit=5, remaining=0, reset_after=seconds)
+
+    cache.deny("a", exhausted(60))
+    cache.deny("b", exhausted(0.001))
+    time.sleep(0.01)
+    assert cache.lookup("b") is None
+
+    cache.deny("c", exhausted(60))
+    cache.deny("d", exhausted(60))
+    assert cache.lookup("a") is None
+    denied = cache.lookup("d")
+    assert denied is not None
+    assert denied.allowed is False
+    assert 0 < denied.reset_after <= 60
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_batching_coalesces_concurrent_checks(fake_redis: Redis):
+    """Test that concurrent checks share pipelined round trips with per-caller results."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    rate_limiter._batcher = RateLimitBatcher(
+        rate_limiter._execute_batch, max_size=8, max_delay=0
+    )
+    limit = rate_limiter._settings.rate_limit_requests
+
+    results = await asyncio.gather(
+        *(rate_limiter.is_allowed(f"test-ip-batch-{i % 2}") for i in range(20))
+    )
+
+    assert sum(verdict.allowed for verdict in results) == 2 * limit
+    stats = rate_limiter.stats()["batching"]
+    assert stats["calls"] == 20
+    assert stats["batches"] < 20
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_batching_reloads_flushed_script(fake_redis: Redis):
+    """Test that a flushed script cache is reloaded for pipelined calls."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    rate_limiter._batcher = RateLimitBatcher(
+        rate_limiter._execute_batch, max_size=8, max_delay=0
+    )
+    await rate_limiter.is_allowed("test-ip-14")
+    await fake_redis.script_flush()
+
+    verdict = await rate_limiter.is_allowed("test-ip-14")
+
+    assert verdict.allowed is True
+    assert verdict.remaining == verdict.limit - 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_discovers_master_by_sentinel_majority():
+    """Test that sentinels are queried concurrently and a majority wins early."""
+    rate_limiter = RateLimiter()
+    rate_limiter._settings = rate_limiter._settings.model_copy(
+        update={"redis_sentinel_hosts": "s1:26379,s2:26379,s3:26379"}
+    )
+
+    async def query(host: str, port: int) -> tuple[str, int]:
+        if host == "s1":
+            await asyncio.sleep(10)  # Unreachable sentinel must not delay startup
+        return ("10.0.0.5", 6379)
+
+    with patch.object(rate_limiter, "_query_sentinel", side_effect=query):
+        address, ordered = await asyncio.wait_for(rate_limiter._discover_master(), 1)
+
+    assert address == ("10.0.0.5", 6379)
+    assert ordered[-1] == ("s1", 26379)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_sentinel_client_follows_majority_not_first_responder():
+    """Test that a minority sentinel answering first cannot pick the master."""
+    rate_limiter = RateLimiter()
+    rate_limiter._settings = rate_limiter._settings.model_copy(
+        update={"redis_sentinel_hosts": "s1:26379,s2:26379,s3:26379", "redis_replica_reads": False}
+    )
+
+    async def query(host: str, port: int) -> tuple[str, int]:
+        if host == "s1":
+            return ("10.0.0.9", 6379)  # Stale view of a demoted master
+        await asyncio.sleep(0.01)
+        return ("10.0.0.5", 6379)
+
+    with (
+        patch.object(rate_limiter, "_query_sentinel", side_effect=query),
+        patch("app.services.rate_limiter.Sentinel") as sentinel_class,
+    ):
+        sentinel_class.return_value.master_for.return_value = AsyncMock()
+        _, _, via = await asyncio.wait_for(rate_limiter._connect_sentinel(), 1)
+
+    assert via == "sentinel master=10.0.0.5:6379"
+    nodes = sentinel_class.call_args.args[0]
+    assert set(nodes[:2]) == {("s2", 26379), ("s3", 26379)}
+    assert nodes[2] == ("s1", 26379)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_connect_races_direct_host(fake_redis: Redis):
+    """Test that the optional direct host is raced with Sentinel, not tried first."""
+    rate_limiter = RateLimiter()
+    rate_limiter._settings = rate_limiter._settings.model_copy(
+        update={"redis_direct_host": "redis-master:6379"}
+    )
+
+    async def slow_sentinel():
+        await asyncio.sleep(10)
+
+    with (
+        patch.object(rate_limiter, "_connect_sentinel", side_effect=slow_sentinel),
+        patch.object(
+            rate_limiter,
+            "_connect_direct",
+            AsyncMock(return_value=(fake_redis, None, "direct host=redis-master:6379")),
+        ),
+    ):
+        await asyncio.wait_for(rate_limiter.connect(), 1)
+
+    assert rate_limiter._redis is fake_redis
+    assert rate_limiter._sentinel is None
+
+
+def rate_limiter_window_ms() -> int:
+    """Window size of the default single-window configuration, in ms."""
+    return RateLimiter()._settings.rate_limit_window_seconds * 1000
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reads_from_fresh_replica(fake_redis: Redis):
+    """Test that introspection reads go to a replica within the lag tolerance."""
+    replica = AsyncMock()
+    replica.info.return_value = {
+        "role": "slave",
+        "master_link_status": "up",
+        "master_last_io_seconds_ago": 0,
+    }
+    window_ms = rate_limiter_window_ms()
+    bucket_start = int(time.time() * 1000) // window_ms * window_ms
+    replica.hgetall.return_value = {
+        f"{window_ms}:s": str(bucket_start),
+        f"{window_ms}:c": "2",
+        f"{window_ms}:p": "0",
+    }
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    rate_limiter._replica = replica
+
+    remaining = await rate_limiter.get_remaining("test-ip-15")
+
+    assert remaining == rate_limiter._settings.rate_limit_requests - 2
+    replica.hgetall.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_replica_reads_fall_back_to_master(fake_redis: Redis):
+    """Test that a lagging replica is skipped in favour of the master."""
+    replica = AsyncMock()
+    replica.info.return_value = {
+        "role": "slave",
+        "master_link_status": "down",
+        "master_last_io_seconds_ago": 60,
+    }
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    rate_limiter._replica = replica
+    await rate_limiter.is_allowed("test-ip-16")
+
+    remaining = await rate_limiter.get_remaining("test-ip-16")
+
+    assert remaining == rate_limiter._settings.rate_limit_requests - 1
+    replica.hgetall.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_multiple_windows_share_one_hash(fake_redis: Redis):
+    """Test that all windows are enforced atomically from a single hash key."""
+    rate_limiter = RateLimiter()
+    rate_limiter._redis = fake_redis
+    rate_limiter._settings = rate_limiter._settings.model_copy(
+        update={"rate_limit_windows": "2/60,4/3600,10/86400"}
+    )
+
+    first = await rate_limiter.is_allowed("test-ip-17")
+    second = await rate_limiter.is_allowed("test-ip-17")
+    third = await rate_limiter.is_allowed("test-ip-17")
+
+    assert (first.allowed, second.allowed, third.allowed) == (True, True, False)
+    assert third.limit == 2
+    assert third.window == 60
+    assert 0 < third.reset_after <= 120
+    assert await fake_redis.keys("ratelimit:contact:*") == ["ratelimit:contact:test-ip-17"]
+    assert await fake_redis.hlen("ratelimit:contact:test-ip-17") == 9
+    assert await fake_redis.pttl("ratelimit:contact:test-ip-17") > 86400 * 1000
+
+
+def test_rate_limit_windows_setting_parsing():
+    """Test parsing of the multi-window setting."""
+    settings = RateLimiter()._settings
+
+    configured = settings.model_copy(update={"rate_limit_windows": "20/86400, 3/60"})
+    fallback = settings.model_copy(update={"rate_limit_windows": ""})
+
+    assert configured.rate_limit_windows_list == [(3, 60), (20, 86400)]
+    assert fallback.rate_limit_windows_list == [
+        (settings.rate_limit_requests, settings.rate_limit_window_seconds)
+    ]
+
+
+@pytest.mark.parametrize("windows", ["3/60,abc", "3", "0/60", "3/60/5"])
+def test_rate_limit_windows_setting_rejects_malformed(windows: str):
+    """Test that a malformed window fails at startup instead of failing open later."""
+    with pytest.raises(ValidationError):
+        Settings(rate_limit_windows=windows)
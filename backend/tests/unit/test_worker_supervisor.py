@@ -0,0 +1,126 @@
+"""Tests for the multi-process worker supervisor."""
+import json
+import signal
+import sys
+import time
+
+from app.supervisor import WorkerSupervisor, read_status
+
+
+def crash(index, heartbeat):
+    """Worker that fails right away."""
+    sys.exit(3)
+
+
+def serve(index, heartbeat):
+    """Worker that beats until SIGTERM, then exits cleanly."""
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    while not stopping:
+        heartbeat.value = time.time()
+        time.sleep(0.01)
+    sys.exit(0)
+
+
+def serve_first(index, heartbeat):
+    """Worker 1 serves, the others fail."""
+    if index != 1:
+        crash(index, heartbeat)
+    serve(index, heartbeat)
+
+
+def ignore_term(index, heartbeat):
+    """Worker that never stops on its own."""
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    while True:
+        time.sleep(0.01)
+
+
+def wait_for(predicate, timeout: float = 5.0) -> None:
+    """Poll until `predicate` is true."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_supervisor_restarts_crashed_child_with_backoff():
+    """Test that a crashing child is restarted after an exponentially growing delay."""
+    supervisor = WorkerSupervisor(1, crash, restart_backoff=0.2, stable_after=60)
+    child = supervisor._children[0]
+    supervisor.start()
+
+    delays = []
+    for _ in range(2):
+        wait_for(lambda: not child.process.is_alive())
+        supervisor.check()
+        assert child.process is None
+        delays.append(child.restart_at - time.monotonic())
+
+        supervisor.check()  # Backoff not over yet
+        assert child.process is None
+        wait_for(lambda: time.monotonic() >= child.restart_at)
+        supervisor.check()
+        assert child.process is not None
+
+    supervisor.stop()
+    assert child.restarts == 2
+    assert 0.1 < delays[0] <= 0.2
+    assert 0.3 < delays[1] <= 0.4
+
+
+def test_supervisor_forwards_sigterm_and_reports_health(tmp_path):
+    """Test that healthy children are reported and stop cleanly on SIGTERM."""
+    status_path = tmp_path / "status.json"
+    supervisor = WorkerSupervisor(2, serve, status_path=str(status_path))
+    supervisor.start()
+    processes = [child.process for child in supervisor._children]
+
+    wait_for(lambda: supervisor.status()["status"] == "healthy")
+    supervisor._write_status()
+    status = read_status(str(status_path), max_age=10)
+    assert status["healthy"] == 2
+    assert all(child["pid"] for child in status["children"])
+
+    supervisor.stop()
+    assert [process.exitcode for process in processes] == [0, 0]
+    assert supervisor.status()["status"] == "stopping"
+
+
+def test_supervisor_status_degraded_when_a_child_is_down():
+    """Test that one dead child out of two makes the status degraded."""
+    supervisor = WorkerSupervisor(2, serve_first, restart_backoff=60)
+    supervisor.start()
+
+    wait_for(lambda: not supervisor._children[1].process.is_alive())
+    supervisor.check()
+    wait_for(lambda: supervisor.status()["healthy"] == 1)
+
+    assert supervisor.status()["status"] == "degraded"
+    supervisor.stop()
+
+
+def test_supervisor_kills_child_that_ignores_sigterm():
+    """Test that a child still running after the shutdown timeout is killed."""
+    supervisor = WorkerSupervisor(1, ignore_term, shutdown_timeout=0.2)
+    supervisor.start()
+    process = supervisor._children[0].process
+    time.sleep(0.1)
+
+    supervisor.stop()
+
+    assert process.exitcode == -signal.SIGKILL
+
+
+def test_read_status_stale_or_missing(tmp_path):
+    """Test that a missing or stale status file reads as unhealthy."""
+    path = tmp_path / "status.json"
+    assert read_status(str(path), max_age=10)["status"] == "unhealthy"
+
+    path.write_text(json.dumps({"status": "healthy", "updated_at": time.time() - 60}))
+    assert read_status(str(path), max_age=10)["status"] == "unhealthy"
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState } from 'react';
+import { useRef, useState } from 'react';
 import { useInView } from '@/hooks/useInView';
 import clsx from 'clsx';
 import { useTranslations } from 'next-intl';
@@ -41,6 +41,8 @@ export function Contact() {
   });
   const [status, setStatus] = useState<'idle' | 'loading' | 'success' | 'error'>('idle');
   const [statusMessage, setStatusMessage] = useState('');
+  // Idempotency-Key reused while the same form content is resubmitted
+  const idempotencyRef = useRef<{ body: string; key: string } | null>(null);
 
   const toggleChannel = (channel: ContactChannel) => {
     setSelectedChannels(prev => {
@@ -83,24 +85,36 @@ export function Contact() {
       }
     }
 
+    const body = JSON.stringify({
+      name: formData.name,
+      message: formData.message,
+      channels: selectedChannels,
+      contacts: formData.contacts,
+    });
+    if (idempotencyRef.current?.body !== body) {
+      const key =
+        typeof crypto !== 'undefined' && 'randomUUID' in crypto
+          ? crypto.randomUUID()
+          : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+      idempotencyRef.current = { body, key };
+    }
+    const idempotencyKey = idempotencyRef.current.key;
+
     try {
       const response = await fetch('/api/public/contact', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
           'api-key': process.env.NEXT_PUBLIC_API_KEY || 'public-key',
+          'Idempotency-Key': idempotencyKey,
         },
-        body: JSON.stringify({
-          name: formData.name,
-          message: formData.message,
-          channels: selectedChannels,
-          contacts: formData.contacts,
-        }),
+        body,
       });
 
       const data = await response.json();
 
       if (response.ok && data.status === 'queued') {
+        idempotencyRef.current = null;
         setStatus('success');
         setStatusMessage(t('form.success'));
         setFormData({ name: '', message: '', contacts: {} as Record<ContactChannel, string> });